@@ -55,8 +55,7 @@ class AdvancedConfig(WindowLayout):
         self.set_title_text("Advanced Configuration")
 
         # Hide log button to start
-        self.next_back.hide_log_button()
-        self.next_back.hide_monitor_button()
+        self.next_back.set_visibility(log_button=False, monitor_button=False)
 
         # Set up and configure the edit frame, which will contain the editboxes
         self.edit_frame = ctk.CTkFrame(self.main_frame, height=360)
@@ -109,7 +108,7 @@ class AdvancedConfig(WindowLayout):
         self.instruction_label.grid(column=0, row=0, columnspan=2, padx=5, pady=5)
 
         # get list of files to edit
-        local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+        local_repo_dir = pd[self.product]["repo_local_dir"]
         self.product_dir = fm.get_install_dir(local_repo_dir)
         self.edit_list = fm.get_config_files(self.product_dir, pd[self.product]["minimum_config_files"])
         if "other_config_files" in pd[self.product]:
@@ -27,35 +27,77 @@ along with CommandStation.  If not, see <https://www.gnu.org/licenses/>.
 
 import platform
 import os
+import stat
 import sys
 import tempfile
+import time
 import subprocess
-import json
-from threading import Thread, Lock
-from collections import namedtuple
+from threading import Lock
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 import logging
-from datetime import datetime, timedelta
 import shutil
+from types import MappingProxyType
 
 from .file_manager import ThreadedDownloader, ThreadedExtractor
 
+# Use orjson if available as it parses the CLI's bytes output directly and much faster than the json module
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Operating system, CLI executable name, and Windows process startup options only need to be determined once
+_SYSTEM = platform.system()
+_CLI_EXE = "arduino-cli.exe" if _SYSTEM == "Windows" else "arduino-cli"
+_STARTUPINFO = None
+if _SYSTEM == "Windows":
+    _STARTUPINFO = subprocess.STARTUPINFO()
+    _STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+
+# Shared pool of worker threads for Arduino CLI commands, avoids starting a new thread for every command
+_ACLI_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="acli")
+
+# Invariant parameters for each Arduino CLI command, variable pieces are added by the calling method
+_FORMAT_JSON = ("--format", "jsonmini")
+_PARAMS_VERSION = ("version", *_FORMAT_JSON)
+_PARAMS_CORE_LIST = ("core", "list", *_FORMAT_JSON)
+_PARAMS_LIB_LIST = ("lib", "list", *_FORMAT_JSON)
+_PARAMS_CONFIG_INIT = ("config", "init", *_FORMAT_JSON, "--overwrite")
+_PARAMS_UPDATE_INDEX = ("core", "update-index", *_FORMAT_JSON)
+_PARAMS_CORE_UPGRADE = ("core", "upgrade", *_FORMAT_JSON)
+_PARAMS_BOARD_LIST = ("board", "list", *_FORMAT_JSON)
+_PARAMS_ESP32_UPLOAD = ("--board-options", "UploadSpeed=115200")
+
+
+class QueueMessage:
+    """
+    Message placed in the queue to report the status, topic, and data of Arduino CLI commands
+    """
+
+    __slots__ = ("status", "topic", "data")
+
+    def __init__(self, status, topic, data):
+        self.status = status
+        self.topic = topic
+        self.data = data
 
-QueueMessage = namedtuple("QueueMessage", ["status", "topic", "data"])
+    def __repr__(self):
+        return f"QueueMessage(status={self.status!r}, topic={self.topic!r}, data={self.data!r})"
 
 
-@staticmethod
 def get_exception(error):
     """
     Get an exception into text to add to the queue
     """
-    template = "An exception of type {0} occurred. Arguments:\n{1!r}"
-    message = template.format(type(error).__name__, error.args)
-    return message
+    return f"An exception of type {type(error).__name__} occurred. Arguments:\n{error.args!r}"
 
 
-class ThreadedArduinoCLI(Thread):
+class ThreadedArduinoCLI:
     """
-    Class to run Arduino CLI commands in a separate thread, returning results to the provided queue
+    Class to run Arduino CLI commands in a worker thread, returning results to the provided queue
+
+    Commands are run by the shared Arduino CLI thread pool when start() is called
 
     There is a default timeout of 5 minutes (300 seconds) for any thread being started, after which
     they will be terminated
@@ -65,112 +107,152 @@ class ThreadedArduinoCLI(Thread):
 
     arduino_cli_lock = Lock()
 
-    def __init__(self, acli_path, params, queue, time_limit=300):
+    # Parameters identifying commands that modify the Arduino CLI's state, only these need the lock
+    mutating_commands = {"install", "upgrade", "update-index", "init"}
+
+    def __init__(self, acli_path, params, queue, time_limit=300, raw=False):
         """
         Initialise the object
 
         Need to provide:
         - full path the Arduino CLI executable/binary
-        - a list of valid parameters
+        - a list or tuple of valid parameters
         - the queue instance to update
-        """
-        super().__init__()
 
+        Set "raw" to return successful output as the unparsed bytes if the caller doesn't need the details
+        """
         # Set up logger
         self.log = logging.getLogger(__name__)
         self.log.debug("Start thread")
 
         self.params = params
-        self.process_params = [acli_path]
-        self.process_params += self.params
+        self.process_params = [acli_path, *params]
         self.queue = queue
-        self.time_limit = timedelta(seconds=time_limit)
+        self.time_limit = time_limit
+        self.raw = raw
 
-    def run(self, *args, **kwargs):
+    def start(self):
         """
-        Override for Thread.run()
+        Submit the command to the Arduino CLI thread pool
 
-        Creates a thread and executes with the provided parameters
+        Returns the Future for the running command
+        """
+        future = _ACLI_POOL.submit(self.run)
+        future.add_done_callback(self.check_result)
+        return future
+
+    def check_result(self, future):
+        """
+        Report any unhandled exception from the command to the queue, otherwise it is silently kept in the Future
+        """
+        error = future.exception()
+        if error is not None:
+            message = get_exception(error)
+            self.queue.put(
+                QueueMessage("error", "Unexpected error running the Arduino CLI", message)
+            )
+            self.log.error(message)
+
+    def run(self):
+        """
+        Executes the Arduino CLI with the provided parameters
 
         Results are placed in the provided queue object
         """
-        start_time = datetime.now()
         self.queue.put(
             QueueMessage("info", "Run Arduino CLI", f"Arduino CLI parameters: {self.params}")
         )
         self.log.debug("Queue info %s", self.params)
-        with self.arduino_cli_lock:
+        # Only commands that change the installed platforms, libraries, or config need to be serialised
+        if any(param in self.mutating_commands for param in self.params):
+            cli_lock = self.arduino_cli_lock
+        else:
+            cli_lock = nullcontext()
+        with cli_lock:
+            start_time = time.monotonic()
             try:
-                startupinfo = None
-                if platform.system() == "Windows":
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
                 self.process = subprocess.Popen(self.process_params, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                                startupinfo=startupinfo)
-                self.output, self.error = self.process.communicate()
-                self.log.debug(self.process_params)
+                                                startupinfo=_STARTUPINFO)
+                try:
+                    self.output, self.error = self.process.communicate(timeout=self.time_limit)
+                except subprocess.TimeoutExpired:
+                    self.process.kill()
+                    self.output, self.error = self.process.communicate()
+                    self.queue.put(
+                        QueueMessage("error", "The Arduino CLI command did not complete within the timeout period",
+                                     f"The running Arduino CLI command took longer than {self.time_limit} seconds")
+                    )
+                    self.log.error("The running Arduino CLI command took longer than %s seconds", self.time_limit)
+                    self.log.error(self.params)
+                    return
+                self.log.debug("%s completed in %.1f seconds", self.process_params, time.monotonic() - start_time)
             except Exception as error:
                 self.queue.put(
                     QueueMessage("error", str(error), str(error))
                 )
                 self.log.error("Caught exception error: %s", str(error))
-            if (self.time_limit is not None and ((datetime.now() - start_time) > self.time_limit)):
-                self.queue.put(
-                    QueueMessage("error", "The Arduino CLI command did not complete within the timeout period",
-                                 f"The running Arduino CLI command took longer than {self.time_limit}")
-                )
-                self.log.error(f"The running Arduino CLI command took longer than {self.time_limit}")
-                self.log.error(self.params)
-                self.process.terminate()
+                return
+        # Returncode 0 = success, anything else is an error
+        topic = ""
+        data = ""
+        if self.error:
+            error = None
+            # Some errors are emitted as plain text rather than JSON, only attempt to parse if it looks like JSON
+            if self.error.lstrip()[:1] in (b"{", b"["):
+                try:
+                    error = json_loads(self.error)
+                except ValueError:
+                    error = None
+            topic = "Error in compile or upload"
+            data = ""
+            if not isinstance(error, dict):
+                data = self.error.decode(errors="replace")
             else:
-                # Returncode 0 = success, anything else is an error
-                topic = ""
-                data = ""
-                if self.error:
-                    error = json.loads(self.error.decode())
-                    topic = "Error in compile or upload"
-                    data = ""
-                    if "error" in error:
-                        topic = str(error["error"])
-                        data = str(error["error"])
-                    if "output" in error:
-                        if "stdout" in error["output"]:
-                            if error["output"]["stdout"] != "":
-                                data = str(error["output"]["stdout"] + "\n")
-                        if "stderr" in error["output"]:
-                            if error["output"]["stderr"] != "":
-                                data += str(error["output"]["stderr"])
-                    if data == "":
-                        data = error
-                else:
-                    if self.output:
-                        details = json.loads(self.output.decode())
-                        if "success" in details:
-                            if details["success"] is True:
-                                topic = "Success"
-                                data = details["compiler_out"]
-                            else:
-                                topic = details["error"]
-                                data = details["compiler_err"]
-                        else:
-                            topic = "Success"
-                            if "stdout" in details:
-                                data = details["stdout"]
-                            else:
-                                data = details
+                if "error" in error:
+                    topic = str(error["error"])
+                    data = str(error["error"])
+                if "output" in error:
+                    if "stdout" in error["output"]:
+                        if error["output"]["stdout"] != "":
+                            data = str(error["output"]["stdout"] + "\n")
+                    if "stderr" in error["output"]:
+                        if error["output"]["stderr"] != "":
+                            data += str(error["output"]["stderr"])
+                if data == "":
+                    data = error
+        else:
+            # Some commands (eg. core update-index) emit no or only whitespace output, there's nothing to parse
+            if self.raw:
+                topic = "Success"
+                data = self.output
+            elif self.output and not self.output.isspace():
+                details = json_loads(self.output)
+                if "success" in details:
+                    if details["success"] is True:
+                        topic = "Success"
+                        data = details["compiler_out"]
                     else:
-                        topic = "No output"
-                        data = "No output"
-                if self.process.returncode == 0:
-                    status = "success"
-                    self.log.debug(data)
+                        topic = details["error"]
+                        data = details["compiler_err"]
                 else:
-                    status = "error"
-                    self.log.error(data)
-                self.log.debug(f"Thread output, status: {status}\ntopic: {topic}\ndata: {data}\nparams: {self.params}")
-                self.queue.put(
-                    QueueMessage(status, topic, data)
-                )
+                    topic = "Success"
+                    if "stdout" in details:
+                        data = details["stdout"]
+                    else:
+                        data = details
+            else:
+                topic = "No output"
+                data = "No output"
+        if self.process.returncode == 0:
+            status = "success"
+            self.log.debug(data)
+        else:
+            status = "error"
+            self.log.error(data)
+        self.log.debug("Thread output, status: %s\ntopic: %s\ndata: %s\nparams: %s", status, topic, data, self.params)
+        self.queue.put(
+            QueueMessage(status, topic, data)
+        )
 
 
 class ArduinoCLI:
@@ -188,8 +270,11 @@ class ArduinoCLI:
     - delete_cli() - deletes the CLI, returns True|False
     - initialise_config() - adds additional URLs to the CLI config
     - update_index() - performs the core update-index and initial board list
-    - install_package() - installs the provided packages
+    - install_package() - installs the provided package
+    - install_packages() - installs the provided list of packages with one CLI command
     - upgrade_platforms() - performs the core upgrade to ensure all are up to date
+    - install_library() - installs the provided library
+    - install_libraries() - installs the provided list of libraries with one CLI command
     - list_boards() - lists all connected boards, returns list of dictionaries for boards
     - compile_sketch() - compiles the sketch in the provided directory ready for upload
     - upload_sketch() - uploads the sketch in the provided directory to the provided device
@@ -205,6 +290,11 @@ class ArduinoCLI:
         "Windows64": urlbase + "Windows_64bit.zip"
     }
 
+    # The archive to download for this platform is fixed for the life of the application
+    _INSTALLER_KEY = _SYSTEM + ("64" if sys.maxsize > 2**32 else "32")
+    _DOWNLOAD_URL = arduino_downloads.get(_INSTALLER_KEY)
+    _DOWNLOAD_BASENAME = _DOWNLOAD_URL.rsplit("/", 1)[-1] if _DOWNLOAD_URL else None
+
     """
     Expose the currently supported version of the Arduino CLI to use.
     """
@@ -262,6 +352,9 @@ class ArduinoCLI:
         }
     }
 
+    # Comma separated list of the extra platform URLs for the CLI config
+    _EXTRA_URLS = ",".join(extra_platform["url"] for extra_platform in extra_platforms.values())
+
     """
     Dictionary of required Arduino libraries to be installed.
 
@@ -280,7 +373,7 @@ class ArduinoCLI:
     """
     Dictionary of devices supported with EX-Installer to enable selection when detecting unknown devices.
     """
-    supported_devices = {
+    supported_devices = MappingProxyType({
         "Arduino Mega or Mega 2560": "arduino:avr:mega",
         "Arduino Uno": "arduino:avr:uno",
         "Arduino Nano": "arduino:avr:nano",
@@ -288,7 +381,7 @@ class ArduinoCLI:
         "ESP32 Dev Kit": "esp32:esp32:esp32",
         "STMicroelectronics Nucleo F411RE": "STMicroelectronics:stm32:Nucleo_64:pnum=NUCLEO_F411RE",
         "STMicroelectronics Nucleo F446RE": "STMicroelectronics:stm32:Nucleo_64:pnum=NUCLEO_F446RE"
-    }
+    })
 
     """
     Dictionary of DCC-EX specific devices, used to preselect or exclude motor driver definitions.
@@ -298,9 +391,14 @@ class ArduinoCLI:
 
     Future additions must start with "DCC-EX" in order to be used for this purpose.
     """
-    dccex_devices = {
+    dccex_devices = MappingProxyType({
         "DCC-EX EX-CSB1": "EXCSB1"
-    }
+    })
+
+    """
+    Prefixes of the DCC-EX device identifiers (up to the first "_"), used to match motor driver definitions.
+    """
+    dccex_device_prefixes = frozenset(device_id.split("_")[0] for device_id in dccex_devices.values())
 
     def __init__(self, selected_device=None):
         """
@@ -312,6 +410,9 @@ class ArduinoCLI:
         self.detected_devices = []
         self.dccex_device = None
 
+        # The CLI path doesn't change while running, so is only determined once
+        self._cli_file_path = None
+
         # Set up logger
         self.log = logging.getLogger(__name__)
 
@@ -319,35 +420,18 @@ class ArduinoCLI:
         """
         Function to get the full path and filename of the Arduino CLI.
 
-        Cross-platform, returns the full file path or False if there is an error.
+        Cross-platform, returns the full file path.
 
         For example:
         - Linux - /home/<user>/ex-installer/arduino-cli/arduino-cli
         - Windows - C:\\Users\\<user>\\ex-installer\\arduino-cli\\arduino-cli.exe
+
+        The result is cached after the first call.
         """
-        if not platform.system():
-            raise ValueError("Unsupported operating system")
-            _result = False
-            self.log.debug("Unsupported operating system")
-        else:
-            if platform.system() == "Windows":
-                _cli = "arduino-cli.exe"
-            else:
-                _cli = "arduino-cli"
-            if os.path.expanduser("~"):
-                _cli_path = os.path.join(
-                    os.path.expanduser("~"),
-                    "ex-installer",
-                    "arduino-cli",
-                    _cli
-                )
-                _result = _cli_path.replace("\\", "\\\\")   # Need to do this for Windows
-                self.log.debug(_result)
-            else:
-                raise ValueError("Could not obtain user home directory")
-                _result = False
-                self.log.error("Could not obtain user home directory")
-        return _result
+        if self._cli_file_path is None:
+            self._cli_file_path = os.path.join(os.path.expanduser("~"), "ex-installer", "arduino-cli", _CLI_EXE)
+            self.log.debug(self._cli_file_path)
+        return self._cli_file_path
 
     def is_installed(self, file_path):
         """
@@ -357,10 +441,13 @@ class ArduinoCLI:
 
         Returns True or False
         """
-        if os.path.isfile(file_path) and os.access(file_path, os.X_OK):
-            _result = True
-        else:
+        try:
+            mode = os.stat(file_path).st_mode
+        except OSError:
             _result = False
+        else:
+            # Windows has no execute permission, os.access() previously only confirmed the file existed
+            _result = stat.S_ISREG(mode) and (_SYSTEM == "Windows" or bool(mode & 0o111))
         self.log.debug(_result)
         return _result
 
@@ -371,8 +458,7 @@ class ArduinoCLI:
         If obtaining the version is successful it will be in the queue's "data" field
         """
         if self.is_installed(file_path):
-            params = ["version", "--format", "jsonmini"]
-            acli = ThreadedArduinoCLI(file_path, params, queue)
+            acli = ThreadedArduinoCLI(file_path, _PARAMS_VERSION, queue)
             acli.start()
         else:
             queue.put(
@@ -387,8 +473,7 @@ class ArduinoCLI:
         If successful, the list will be in the queue's "data" field
         """
         if self.is_installed(file_path):
-            params = ["core", "list", "--format", "jsonmini"]
-            acli = ThreadedArduinoCLI(file_path, params, queue)
+            acli = ThreadedArduinoCLI(file_path, _PARAMS_CORE_LIST, queue)
             acli.start()
         else:
             queue.put(
@@ -403,8 +488,7 @@ class ArduinoCLI:
         If successful, the list will be in the queue's "data" field
         """
         if self.is_installed(file_path):
-            params = ["lib", "list", "--format", "jsonmini"]
-            acli = ThreadedArduinoCLI(file_path, params, queue)
+            acli = ThreadedArduinoCLI(file_path, _PARAMS_LIB_LIST, queue)
             acli.start()
         else:
             queue.put(
@@ -420,30 +504,17 @@ class ArduinoCLI:
 
         If error, the error will be in the queue's "data" field
         """
-        if not platform.system():
-            self.log.error("Unsupported operating system")
+        self.log.debug(ArduinoCLI._INSTALLER_KEY)
+        if ArduinoCLI._DOWNLOAD_URL:
+            _target_file = os.path.join(tempfile.gettempdir(), ArduinoCLI._DOWNLOAD_BASENAME)
+            download = ThreadedDownloader(ArduinoCLI._DOWNLOAD_URL, _target_file, queue)
+            download.start()
+        else:
+            self.log.error("No Arduino CLI available for this operating system")
             queue.put(
-                QueueMessage("error", "Unsupported operating system", "Unsupported operating system")
+                QueueMessage("error", "No Arduino CLI available for this operating system",
+                             "No Arduino CLI available for this operating system")
             )
-        else:
-            if sys.maxsize > 2**32:
-                _installer = platform.system() + "64"
-            else:
-                _installer = platform.system() + "32"
-            self.log.debug(_installer)
-            if _installer in ArduinoCLI.arduino_downloads:
-                _target_file = os.path.join(
-                    tempfile.gettempdir(),
-                    ArduinoCLI.arduino_downloads[_installer].split("/")[-1]
-                )
-                download = ThreadedDownloader(ArduinoCLI.arduino_downloads[_installer], _target_file, queue)
-                download.start()
-            else:
-                self.log.error("No Arduino CLI available for this operating system")
-                queue.put(
-                    QueueMessage("error", "No Arduino CLI available for this operating system",
-                                 "No Arduino CLI available for this operating system")
-                )
 
     def install_cli(self, download_file, file_path, queue):
         """
@@ -476,7 +547,7 @@ class ArduinoCLI:
                 shutil.rmtree(cli_directory)
                 _result = True
             except Exception as e:
-                self.log.error(f"Unable to delete {cli_directory}: {e}")
+                self.log.error("Unable to delete %s: %s", cli_directory, e)
         return _result
 
     def initialise_config(self, file_path, queue):
@@ -485,13 +556,9 @@ class ArduinoCLI:
 
         Overwrites existing configuration options.
         """
-        params = ["config", "init", "--format", "jsonmini", "--overwrite"]
-        if len(self.extra_platforms) > 0:
-            platform_list = []
-            for extra_platform in self.extra_platforms:
-                platform_list.append(self.extra_platforms[extra_platform]["url"])
-            _url_list = ",".join(platform_list)
-            params += ["--additional-urls", _url_list]
+        params = _PARAMS_CONFIG_INIT
+        if self._EXTRA_URLS:
+            params += ("--additional-urls", self._EXTRA_URLS)
         acli = ThreadedArduinoCLI(file_path, params, queue)
         acli.start()
 
@@ -499,49 +566,60 @@ class ArduinoCLI:
         """
         Update the Arduino CLI core index
         """
-        params = ["core", "update-index", "--format", "jsonmini"]
-        acli = ThreadedArduinoCLI(file_path, params, queue)
+        acli = ThreadedArduinoCLI(file_path, _PARAMS_UPDATE_INDEX, queue)
         acli.start()
 
     def install_package(self, file_path, package, queue):
         """
-        Install packages for the listed Arduino platforms
+        Install the package for the specified Arduino platform
+        """
+        self.install_packages(file_path, [package], queue)
+
+    def install_packages(self, file_path, packages, queue):
         """
-        params = ["core", "install", package, "--format", "jsonmini"]
-        acli = ThreadedArduinoCLI(file_path, params, queue, 600)
+        Install packages for the listed Arduino platforms in a single CLI command
+        """
+        params = ("core", "install", *packages, *_FORMAT_JSON)
+        acli = ThreadedArduinoCLI(file_path, params, queue, 600 * len(packages))
         acli.start()
 
     def upgrade_platforms(self, file_path, queue):
         """
         Upgrade Arduino CLI platforms
         """
-        params = ["core", "upgrade", "--format", "jsonmini"]
-        acli = ThreadedArduinoCLI(file_path, params, queue)
+        acli = ThreadedArduinoCLI(file_path, _PARAMS_CORE_UPGRADE, queue)
         acli.start()
 
     def install_library(self, file_path, library, queue):
         """
         Install the specified Arduino library
         """
-        params = ["lib", "install", library, "--format", "jsonmini"]
-        acli = ThreadedArduinoCLI(file_path, params, queue)
+        self.install_libraries(file_path, [library], queue)
+
+    def install_libraries(self, file_path, libraries, queue):
+        """
+        Install the listed Arduino libraries in a single CLI command
+        """
+        params = ("lib", "install", *libraries, *_FORMAT_JSON)
+        acli = ThreadedArduinoCLI(file_path, params, queue, 300 * len(libraries))
         acli.start()
 
-    def list_boards(self, file_path, queue):
+    def list_boards(self, file_path, queue, raw=False):
         """
         Returns a list of attached boards
+
+        Set "raw" if only the outcome is required, skipping parsing the list
         """
-        params = ["board", "list", "--format", "jsonmini"]
-        acli = ThreadedArduinoCLI(file_path, params, queue, 120)
+        acli = ThreadedArduinoCLI(file_path, _PARAMS_BOARD_LIST, queue, 120, raw)
         acli.start()
 
     def upload_sketch(self, file_path, fqbn, port, sketch_dir, queue):
         """
         Compiles and uploads the sketch in the specified directory to the provided board/port.
         """
-        params = ["upload", "-v", "-t", "-b", fqbn, "-p", port, sketch_dir, "--format", "jsonmini"]
+        params = ("upload", "-v", "-t", "-b", fqbn, "-p", port, sketch_dir, *_FORMAT_JSON)
         if fqbn.startswith('esp32:esp32'):
-            params = params + ["--board-options", "UploadSpeed=115200"]
+            params += _PARAMS_ESP32_UPLOAD
         acli = ThreadedArduinoCLI(file_path, params, queue)
         acli.start()
 
@@ -549,6 +627,6 @@ class ArduinoCLI:
         """
         Compiles the sketch ready to upload
         """
-        params = ["compile", "-b", fqbn, sketch_dir, "--format", "jsonmini"]
+        params = ("compile", "-b", fqbn, sketch_dir, *_FORMAT_JSON)
         acli = ThreadedArduinoCLI(file_path, params, queue)
         acli.start()
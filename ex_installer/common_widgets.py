@@ -26,7 +26,10 @@ along with CommandStation.  If not, see <https://www.gnu.org/licenses/>.
 # Import Python modules
 import customtkinter as ctk
 from PIL import Image
+from functools import lru_cache
 from queue import Queue
+from threading import Thread, Event
+from tkinter import TclError
 import logging
 import platform
 import os
@@ -38,6 +41,76 @@ from . import images
 from .serial_monitor import SerialMonitor
 from .common_fonts import CommonFonts
 
+# Set up logger
+log = logging.getLogger(__name__)
+
+# Operating system only needs to be determined once, and with it how to open the log file
+_PLATFORM = platform.system()
+if _PLATFORM == "Windows":
+    _OPEN_LOG = os.startfile
+else:
+    _OPEN_COMMAND = "open" if _PLATFORM == "Darwin" else "xdg-open"
+
+    def _OPEN_LOG(log_file):
+        subprocess.call((_OPEN_COMMAND, log_file))
+
+# Images shared by all widgets, keyed by file path and size
+_IMAGE_CACHE = {}
+
+
+@lru_cache(maxsize=None)
+def _get_fonts(root):
+    """
+    Get the common fonts for the provided top level window, these are created once and shared by all its widgets
+    """
+    return CommonFonts(root)
+
+
+def _get_image(path, size):
+    """
+    Get a CTkImage for the provided image file and size, the file is only opened and decoded once
+    """
+    key = (path, size)
+    image = _IMAGE_CACHE.get(key)
+    if image is None:
+        image = ctk.CTkImage(light_image=Image.open(path), size=size)
+        _IMAGE_CACHE[key] = image
+    return image
+
+
+# Bullet point margins for FormattedTextbox, keyed by font name
+_BULLET_MARGINS = {}
+
+
+def _bullet_margins(font):
+    """
+    Get the bullet point margins for the provided font, these are only measured once per font
+    """
+    margins = _BULLET_MARGINS.get(font.name)
+    if margins is None:
+        em = font.measure("m")
+        margins = (em, em + font.measure("\u2022"))
+        _BULLET_MARGINS[font.name] = margins
+    return margins
+
+
+# Tooltip states
+_TOOLTIP_IDLE = 0
+_TOOLTIP_SCHEDULED = 1
+_TOOLTIP_SHOWN = 2
+
+# Input widget types that are disabled while a process is running
+_INPUT_WIDGETS = (ctk.CTkButton, ctk.CTkComboBox, ctk.CTkCheckBox, ctk.CTkEntry, ctk.CTkRadioButton, ctk.CTkSwitch)
+
+# Whether each widget class is an input widget, filled in as classes are first seen
+_IS_INPUT_CLASS = {}
+
+# Number of widgets to process before yielding back to the event loop when disabling input widgets
+_DISABLE_SLICE = 32
+
+# Seconds to wait for the queue monitoring thread to stop when a view is destroyed
+_MONITOR_JOIN_TIMEOUT = 1
+
 
 class WindowLayout(ctk.CTkFrame):
     """
@@ -49,16 +122,14 @@ class WindowLayout(ctk.CTkFrame):
     def __init__(self, parent, *args, **kwargs):
         super().__init__(parent, *args, **kwargs)
 
-        # Set up logger
-        self.log = logging.getLogger(__name__)
-        self.log.debug("Start view")
+        log.debug("Start view")
 
         # Get parent Arduino CLI and Git client instances
         self.acli = parent.acli
         self.git = parent.git
 
         # Set up fonts
-        self.common_fonts = CommonFonts(self)
+        self.common_fonts = _get_fonts(self.winfo_toplevel())
 
         # Get application version
         self.app_version = parent.app_version
@@ -77,15 +148,22 @@ class WindowLayout(ctk.CTkFrame):
         self.process_status = None
         self.process_topic = None
         self.process_data = None
+        self.process_progress = None
 
         # Flag as to whether a process is in progress or not, used to disable/restore input states
         self.process_running = False
 
-        # Set up queue for process monitoring
+        # Set up queue for process monitoring, a background thread waits on it while a process is being monitored
         self.queue = Queue()
+        self.monitor_event = None
+        self.monitor_armed = Event()
+        self.monitor_stop = Event()
+        self.monitor_thread = None
 
-        # Variable for storing widget states while processes run
+        # Variable for storing widget states while processes run, and the pending job while disabling them
+        self.state_widgets = []
         self.widget_states = []
+        self.disable_job = None
 
         # Define fonts
         self.instruction_font = self.common_fonts.instruction_font
@@ -134,7 +212,9 @@ class WindowLayout(ctk.CTkFrame):
         self.next_back.grid(column=0, row=1, sticky="sew")
 
         # Setup status frame and widgets
-        self.status_label = ctk.CTkLabel(self.status_frame, text="Idle",
+        self.process_status_text = ctk.StringVar(self, value="Idle")
+        self.status_color = None
+        self.status_label = ctk.CTkLabel(self.status_frame, textvariable=self.process_status_text,
                                          font=self.instruction_font, wraplength=780)
         self.progress_bar = ctk.CTkProgressBar(self.status_frame, width=780, height=20,
                                                mode="indeterminate", orientation="horizontal")
@@ -142,6 +222,10 @@ class WindowLayout(ctk.CTkFrame):
         # Layout status frame
         self.status_label.grid(column=0, row=0, padx=5, pady=5)
         self.progress_bar.grid(column=0, row=1, padx=5, pady=5)
+
+        # Processes that report progress switch the progress bar to show it
+        self.progress_determinate = False
+        self.bind("<<Process_Progress>>", self.show_progress)
         self.process_stop()
 
     def set_title_logo(self, logo):
@@ -150,8 +234,7 @@ class WindowLayout(ctk.CTkFrame):
 
         Call and pass a logo as defined in the images module
         """
-        self.title_logo = Image.open(logo)
-        self.title_image = ctk.CTkImage(light_image=self.title_logo, size=(200, 40))
+        self.title_image = _get_image(logo, (200, 40))
         self.title_logo_label.configure(image=self.title_image)
 
     def set_title_text(self, text):
@@ -163,16 +246,61 @@ class WindowLayout(ctk.CTkFrame):
     def monitor_queue(self, queue, event):
         """
         Monitor the provided queue for status updates
+
+        The queue is watched by a single background thread per view that blocks until an item arrives, so there is
+        no polling, and the provided event is generated as soon as the process succeeds or fails
+        """
+        self.monitor_event = event
+        self.monitor_armed.set()
+        if self.monitor_thread is None:
+            self.monitor_thread = Thread(target=self.wait_for_queue, args=(queue,), daemon=True)
+            self.monitor_thread.start()
+
+    def wait_for_queue(self, queue):
+        """
+        Background thread to block on the queue while a process is monitored
+
+        Status details are stored before the event is generated, and monitoring pauses until the next process starts
+
+        The thread ends when the view is destroyed, which sets monitor_stop and puts None on the queue
         """
-        while not queue.empty():
+        while True:
+            self.monitor_armed.wait()
+            if self.monitor_stop.is_set():
+                return
             item = queue.get()
-            if item.status == "success" or item.status == "error":
+            if item is None or self.monitor_stop.is_set():
+                return
+            if item.status == "progress":
+                self.process_progress = item.data
+                try:
+                    self.event_generate("<<Process_Progress>>", when="tail")
+                except (TclError, RuntimeError) as error:
+                    log.debug("Stop monitoring queue: %s", error)
+                    return
+            elif item.status in ("success", "error"):
+                self.monitor_armed.clear()
                 self.process_status = item.status
                 self.process_topic = item.topic
                 self.process_data = item.data
-                self.event_generate(f"<<{event}>>")
-                return
-        self.after(100, self.monitor_queue, queue, event)
+                try:
+                    self.event_generate(f"<<{self.monitor_event}>>", when="tail")
+                except (TclError, RuntimeError) as error:
+                    log.debug("Stop monitoring queue: %s", error)
+                    return
+
+    def destroy(self):
+        """
+        Stop the queue monitoring thread before destroying the view, so it doesn't keep the view alive
+        """
+        if self.monitor_thread is not None:
+            self.monitor_stop.set()
+            self.monitor_armed.set()
+            self.queue.put(None)
+            # The thread may be waiting for this thread to handle a generated event, so don't wait indefinitely
+            self.monitor_thread.join(_MONITOR_JOIN_TIMEOUT)
+            self.monitor_thread = None
+        super().destroy()
 
     def process_start(self, next_phase, activity, event):
         """
@@ -184,10 +312,25 @@ class WindowLayout(ctk.CTkFrame):
             self.disable_input_states(self)
             self.process_running = True
         self.process_phase = next_phase
-        self.status_label.configure(text=activity, text_color="#00353D")
+        self.set_status(activity, "#00353D")
         self.monitor_queue(self.queue, event)
+        if self.progress_determinate:
+            self.progress_determinate = False
+            self.progress_bar.configure(mode="indeterminate")
         self.progress_bar.start()
 
+    def show_progress(self, event=None):
+        """
+        Show the progress reported by the running process, switching the progress bar to determinate mode
+        """
+        if self.process_phase is None or self.process_progress is None:
+            return
+        if not self.progress_determinate:
+            self.progress_determinate = True
+            self.progress_bar.stop()
+            self.progress_bar.configure(mode="determinate")
+        self.progress_bar.set(self.process_progress)
+
     def process_stop(self):
         """
         Stops the progress bar and resets status text.
@@ -197,9 +340,9 @@ class WindowLayout(ctk.CTkFrame):
         if self.process_running:
             self.restore_input_states()
             self.process_running = False
-        self.log.debug("process_stop()")
+        log.debug("process_stop()")
         self.progress_bar.stop()
-        self.status_label.configure(text="Idle", text_color="#00353D")
+        self.set_status("Idle", "#00353D")
         self.process_phase = None
 
     def process_error(self, message):
@@ -212,32 +355,82 @@ class WindowLayout(ctk.CTkFrame):
             self.restore_input_states()
             self.process_running = False
         self.progress_bar.stop()
-        self.status_label.configure(text=message, text_color="red")
+        self.set_status(message, "red")
         self.process_phase = None
         self.next_back.show_log_button()
 
+    def set_status(self, text, text_color):
+        """
+        Update the status text, the label's colour is only changed when it differs
+        """
+        self.process_status_text.set(text)
+        if text_color != self.status_color:
+            self.status_color = text_color
+            self.status_label.configure(text_color=text_color)
+
     def disable_input_states(self, widget):
         """
         Stores current state of all child input widgets then sets to disabled
-        """
-        children = widget.winfo_children()
-        for child in children:
-            if isinstance(child, (ctk.CTkButton, ctk.CTkComboBox, ctk.CTkCheckBox, ctk.CTkEntry,
-                                  ctk.CTkRadioButton, ctk.CTkSwitch)):
-                widget_state = {
-                    "widget": child,
-                    "state": child.cget("state")
-                }
-                self.widget_states.append(widget_state)
-                child.configure(state="disabled")
-            self.disable_input_states(child)
+
+        The widgets are processed in slices from the event loop so the interface can redraw in between
+        """
+        self._pump_disable(self._disable_iter(widget))
+
+    def _disable_iter(self, widget):
+        """
+        Generator to disable child input widgets, yielding after every slice of widgets
+
+        The tree is walked using each widget's children dict so no Tcl calls are needed to find descendants
+        """
+        stack = [widget]
+        append_widget = self.state_widgets.append
+        append_state = self.widget_states.append
+        is_input_class = _IS_INPUT_CLASS
+        count = 0
+        while stack:
+            children = tuple(stack.pop().children.values())
+            stack.extend(children)
+            for child in children:
+                child_class = type(child)
+                is_input = is_input_class.get(child_class)
+                if is_input is None:
+                    is_input = is_input_class[child_class] = issubclass(child_class, _INPUT_WIDGETS)
+                if is_input:
+                    state = child.cget("state")
+                    append_widget(child)
+                    append_state(state)
+                    if state != "disabled":
+                        child.configure(state="disabled")
+            count += len(children)
+            if count >= _DISABLE_SLICE:
+                count = 0
+                yield
+
+    def _pump_disable(self, states):
+        """
+        Process the next slice of widgets to disable, and schedule the following slice when idle
+        """
+        try:
+            next(states)
+        except StopIteration:
+            self.disable_job = None
+        else:
+            self.disable_job = self.after_idle(self._pump_disable, states)
 
     def restore_input_states(self):
         """
         Restores the state of all widgets
+
+        If widgets are still being disabled this is cancelled first
         """
-        for widget in self.widget_states:
-            widget["widget"].configure(state=widget["state"])
+        if self.disable_job is not None:
+            self.after_cancel(self.disable_job)
+            self.disable_job = None
+        for widget, state in zip(self.state_widgets, self.widget_states):
+            if widget.cget("state") != state:
+                widget.configure(state=state)
+        self.state_widgets.clear()
+        self.widget_states.clear()
 
     @staticmethod
     def get_exception(error):
@@ -253,48 +446,56 @@ class NextBack(ctk.CTkFrame):
     """
     Class for defining and managing the next and back buttons
     """
+    # Options for each role of the centre button
+    center_buttons = {
+        "log": {"text": "Show Log", "width": 100},
+        "monitor": {"text": "View device monitor", "width": 150}
+    }
+
+    # Path to the application's log file, found when the log is first shown
+    _log_file_path = None
+
     def __init__(self, parent, *args, **kwargs):
         """
         Create the next/back button frame with buttons
         """
         super().__init__(parent, *args, **kwargs)
 
-        # Set up logger
-        self.log = logging.getLogger(__name__)
-
         self.grid_columnconfigure((0, 1, 2, 3, 4), weight=1)
 
         # Set up fonts
-        self.common_fonts = CommonFonts(self)
+        self.common_fonts = _get_fonts(self.winfo_toplevel())
 
-        button_font = self.common_fonts.button_font
-        button_options = {"width": 220, "height": 30, "font": button_font}
+        self.button_font = self.common_fonts.button_font
+        button_options = {"width": 220, "height": 30, "font": self.button_font}
 
-        self.back_arrow = Image.open(images.BACK_ARROW)
-        self.back_arrow_image = ctk.CTkImage(light_image=self.back_arrow, size=(15, 15))
+        self.back_arrow_image = _get_image(images.BACK_ARROW, (15, 15))
         self.back_button = ctk.CTkButton(self, image=self.back_arrow_image,
                                          text="Back", compound="left",
                                          anchor="w",
                                          **button_options)
 
-        self.next_arrow = Image.open(images.NEXT_ARROW)
-        self.next_arrow_image = ctk.CTkImage(light_image=self.next_arrow, size=(15, 15))
+        self.next_arrow_image = _get_image(images.NEXT_ARROW, (15, 15))
         self.next_button = ctk.CTkButton(self, image=self.next_arrow_image,
                                          text="Next", compound="right",
                                          anchor="e",
                                          **button_options)
 
-        self.log_button = ctk.CTkButton(self, text="Show Log", width=100, height=30, font=button_font,
-                                        command=self.show_log)
-
         self.back_button.grid(column=0, row=0, padx=3, pady=3, sticky="w")
-        self.log_button.grid(column=2, row=0)
         self.next_button.grid(column=4, row=0, padx=3, pady=3, sticky="e")
 
+        # The log and monitor buttons share a single centre button, created when first shown
+        self.center_button = None
+        self.center_role = None
         self.monitor_window = None
-        self.monitor_button = ctk.CTkButton(self, text="View device monitor", command=self.monitor,
-                                            width=150, height=30, font=button_font)
-        self.monitor_button.grid(column=2, row=0)
+
+        # Current visibility of each button, used to skip grid changes that aren't needed
+        self.button_visible = {
+            "back_button": True,
+            "next_button": True,
+            "log_button": False,
+            "monitor_button": False
+        }
 
     def set_back_text(self, text):
         """Update back button text"""
@@ -310,11 +511,11 @@ class NextBack(ctk.CTkFrame):
 
     def hide_back(self):
         """Hide back button"""
-        self.back_button.grid_remove()
+        self.set_visibility(back_button=False)
 
     def show_back(self):
         """Show back button"""
-        self.back_button.grid()
+        self.set_visibility(back_button=True)
 
     def set_back_command(self, command):
         self.back_button.configure(command=command)
@@ -333,44 +534,93 @@ class NextBack(ctk.CTkFrame):
 
     def hide_next(self):
         """Hide next button"""
-        self.next_button.grid_remove()
+        self.set_visibility(next_button=False)
 
     def show_next(self):
         """Show next button"""
-        self.next_button.grid()
+        self.set_visibility(next_button=True)
 
     def set_next_command(self, command):
         self.next_button.configure(command=command)
 
+    def set_visibility(self, *, back_button=None, next_button=None, log_button=None, monitor_button=None):
+        """
+        Show (True) or hide (False) any of the buttons in a single call
+
+        Buttons already in the requested state are left alone so the grid is only changed when needed
+        """
+        for name, visible in (("back_button", back_button), ("next_button", next_button)):
+            if visible is None or self.button_visible[name] == visible:
+                continue
+            self.button_visible[name] = visible
+            if visible:
+                getattr(self, name).grid()
+            else:
+                getattr(self, name).grid_remove()
+
+        # Log and monitor share the centre button, the most recently shown one takes it
+        role = self.center_role
+        for name, visible in (("log", log_button), ("monitor", monitor_button)):
+            if visible is not None:
+                self.button_visible[f"{name}_button"] = visible
+                if visible:
+                    role = name
+        if role is not None and not self.button_visible[f"{role}_button"]:
+            if self.button_visible["log_button"]:
+                role = "log"
+            elif self.button_visible["monitor_button"]:
+                role = "monitor"
+            else:
+                role = None
+        self.set_center_role(role)
+
+    def set_center_role(self, role):
+        """
+        Function to switch the centre button between the log and monitor roles, or hide it if role is None
+
+        The button is only created when first shown
+        """
+        if role == self.center_role:
+            return
+        previous_role = self.center_role
+        self.center_role = role
+        if role is None:
+            self.center_button.grid_remove()
+            return
+        command = self.show_log if role == "log" else self.monitor
+        if self.center_button is None:
+            self.center_button = ctk.CTkButton(self, height=30, font=self.button_font, command=command,
+                                               **self.center_buttons[role])
+            self.center_button.grid(column=2, row=0)
+        else:
+            self.center_button.configure(command=command, **self.center_buttons[role])
+            if previous_role is None:
+                self.center_button.grid()
+
     def hide_log_button(self):
-        self.log_button.grid_remove()
+        self.set_visibility(log_button=False)
 
     def show_log_button(self):
-        self.log_button.grid()
+        self.set_visibility(log_button=True)
 
     def show_log(self):
-        log_file = None
-        for handler in self.log.parent.handlers:
-            if handler.__class__.__name__ == "FileHandler":
-                log_file = handler.baseFilename
-        if platform.system() == "Darwin":
-            subprocess.call(("open", log_file))
-        elif platform.system() == "Windows":
-            os.startfile(log_file)
-        else:
-            subprocess.call(("xdg-open", log_file))
+        if NextBack._log_file_path is None:
+            for handler in log.parent.handlers:
+                if isinstance(handler, logging.FileHandler):
+                    NextBack._log_file_path = handler.baseFilename
+        _OPEN_LOG(NextBack._log_file_path)
 
     def hide_monitor_button(self):
         """
         Function to hide the monitor button
         """
-        self.monitor_button.grid_remove()
+        self.set_visibility(monitor_button=False)
 
     def show_monitor_button(self):
         """
         Function to show the monitor button
         """
-        self.monitor_button.grid()
+        self.set_visibility(monitor_button=True)
 
     def monitor(self):
         """
@@ -400,8 +650,7 @@ class FormattedTextbox(ctk.CTkTextbox):
     "Item 2",
     "Item 3
     ]
-    for item in bullet_list:
-    -   textbox.insert_bullet("insert", item)
+    textbox.insert_bullets("insert", bullet_list)
     """
     def __init__(self, *args, **kwargs):
         """
@@ -412,11 +661,9 @@ class FormattedTextbox(ctk.CTkTextbox):
         super().__init__(*args, **kwargs)
 
         # Set up fonts
-        self.common_fonts = CommonFonts(self)
+        self.common_fonts = _get_fonts(self.winfo_toplevel())
 
-        default_font = self.common_fonts.instruction_font
-        em = default_font.measure("m")
-        lmargin2 = em + default_font.measure("\u2022")
+        em, lmargin2 = _bullet_margins(self.common_fonts.instruction_font)
         self.tag_config("bullet", lmargin1=em, lmargin2=lmargin2, spacing1=1, spacing2=1, spacing3=1)
 
     def insert_bullet(self, index, text):
@@ -425,6 +672,29 @@ class FormattedTextbox(ctk.CTkTextbox):
         """
         self.insert(index, f"\u2022 {text}", "bullet")
 
+    def insert_bullets(self, index, items):
+        """
+        Function to insert a list of bullet points with a single insert
+        """
+        self.insert_chunks(index, self.bullet_chunks(items))
+
+    def insert_chunks(self, index, chunks):
+        """
+        Function to insert alternating text and tags, as accepted by the Tk text insert command, with a single insert
+        """
+        if chunks:
+            self._textbox.insert(index, *chunks)
+
+    @staticmethod
+    def bullet_chunks(items):
+        """
+        Function to get the text and tag chunks for a list of bullet points, for use with insert_chunks()
+        """
+        chunks = []
+        for item in items:
+            chunks.extend((f"\u2022 {item}", "bullet"))
+        return tuple(chunks)
+
 
 class CreateToolTip(object):
     """
@@ -436,13 +706,22 @@ class CreateToolTip(object):
 
     self.widget = <CustomTkinter widget creation>
     CreateTooltip(self.widget, "Tool tip contextual help text"[, URL])
+
+    A single tooltip window is shared by all tooltips, it is hidden and shown rather than created and destroyed
     """
+    # Most widgets have a tooltip, so instances use slots rather than a __dict__
+    __slots__ = ("wait_time", "wraplength", "widget", "text", "url", "state", "timer", "tooltip_font")
+
+    # Shared tooltip window and label, and the tooltip currently using them
+    shared_toplevel = None
+    shared_label = None
+    shared_owner = None
+
     def __init__(self, widget, text='widget info', url=None):
         """
         Instantiate object
         """
         self.wait_time = 500     # milliseconds
-        self.hide_time = self.wait_time
         self.wraplength = 300   # pixels
         self.widget = widget
         self.text = text
@@ -450,78 +729,104 @@ class CreateToolTip(object):
         self.widget.bind("<Enter>", self.enter_widget)
         self.widget.bind("<Leave>", self.leave_widget)
         self.widget.bind("<ButtonPress>", self.leave_widget)
-        self.id = None
-        self.tw = None
 
-        # Set up fonts
-        self.common_fonts = CommonFonts(self)
+        # Tooltip state, and the single pending show or hide timer
+        self.state = _TOOLTIP_IDLE
+        self.timer = None
+
+        # Font is looked up when the tooltip is first shown
+        self.tooltip_font = None
 
     def enter_widget(self, event=None):
         """
-        When hovered/entered widget, schedule it to start
-        """
-        self.schedule_tooltip()
+        When hovered/entered widget, schedule it to start, or cancel a pending hide if already shown
 
-    def leave_widget(self, event=None):
+        Tooltips without any text are not shown
         """
-        When leaving the widget, schedule the hide
-        """
-        self.unschedule_tooltip()
-        if hasattr(self, "toplevel"):
-            if self.toplevel is not None:
-                self.toplevel.after(self.hide_time, self.hide_tooltip)
+        if self.state == _TOOLTIP_IDLE and self.text:
+            self.state = _TOOLTIP_SCHEDULED
+            self.timer = self.widget.after(self.wait_time, self.show_tooltip)
+        elif self.state == _TOOLTIP_SHOWN:
+            self.cancel_timer()
 
-    def schedule_tooltip(self):
+    def leave_widget(self, event=None):
         """
-        Schedule the tip to appear
+        When leaving the widget, cancel a scheduled tooltip or schedule the hide
         """
-        self.unschedule_tooltip()
-        self.id = self.widget.after(self.wait_time, self.show_tooltip)
+        if self.state == _TOOLTIP_SCHEDULED:
+            self.cancel_timer()
+            self.state = _TOOLTIP_IDLE
+        elif self.state == _TOOLTIP_SHOWN and self.timer is None:
+            self.timer = self.widget.after(self.wait_time, self.hide_tooltip)
 
-    def unschedule_tooltip(self):
+    def cancel_timer(self):
         """
-        Cancel the schedule
+        Cancel the pending show or hide
         """
-        id = self.id
-        self.id = None
-        if id:
-            self.widget.after_cancel(id)
+        timer = self.timer
+        self.timer = None
+        if timer:
+            self.widget.after_cancel(timer)
 
     def show_tooltip(self, event=None):
         """
         Show the tooltip
         """
-        tooltip_font = self.common_fonts.bold_instruction_font
+        self.timer = None
+        self.state = _TOOLTIP_SHOWN
+        if self.tooltip_font is None:
+            self.tooltip_font = _get_fonts(self.widget.winfo_toplevel()).bold_instruction_font
         x = y = 0
         x, y, cx, cy = self.widget.bbox("insert")
         x += self.widget.winfo_rootx() + 25
         y += self.widget.winfo_rooty() + 20
+        toplevel = CreateToolTip.shared_toplevel
+        if toplevel is None or not toplevel.winfo_exists():
+            toplevel = self.create_shared_toplevel()
+        label = CreateToolTip.shared_label
+        label.configure(text=self.text, font=self.tooltip_font, wraplength=self.wraplength)
+        label.unbind("<Button-1>")
+        if self.url is not None:
+            label.bind("<Button-1>", lambda x: self.open_url(self.url))
+        CreateToolTip.shared_owner = self
+        toplevel.wm_geometry("+%d+%d" % (x, y))
+        toplevel.deiconify()
+
+    def create_shared_toplevel(self):
+        """
+        Create the tooltip window shared by all tooltips, initially hidden
+        """
         # creates a toplevel window
-        self.toplevel = ctk.CTkToplevel(self.widget)
+        toplevel = ctk.CTkToplevel(self.widget.winfo_toplevel())
+        toplevel.withdraw()
         # Leaves only the label and removes the app window
-        self.toplevel.wm_overrideredirect(True)
-        self.toplevel.wm_geometry("+%d+%d" % (x, y))
-        self.frame = ctk.CTkFrame(self.toplevel, border_color="#00A3B9", border_width=5, fg_color="#00353D",
-                                  corner_radius=0)
-        self.toplevel.grid_columnconfigure(0, weight=1)
-        self.toplevel.grid_rowconfigure(0, weight=1)
-        self.frame.grid(column=0, row=0)
-        self.frame.grid_columnconfigure(0, weight=1)
-        self.frame.grid_rowconfigure(0, weight=1)
-        self.label = ctk.CTkLabel(self.frame, text=self.text, justify='left', font=tooltip_font,
-                                  wraplength=self.wraplength, text_color="white")
-        if self.url is not None:
-            self.label.bind("<Button-1>", lambda x: self.open_url(self.url))
-        self.label.grid(column=0, row=0, sticky="nsew", padx=15, pady=15)
+        toplevel.wm_overrideredirect(True)
+        frame = ctk.CTkFrame(toplevel, border_color="#00A3B9", border_width=5, fg_color="#00353D",
+                             corner_radius=0)
+        toplevel.grid_columnconfigure(0, weight=1)
+        toplevel.grid_rowconfigure(0, weight=1)
+        frame.grid(column=0, row=0)
+        frame.grid_columnconfigure(0, weight=1)
+        frame.grid_rowconfigure(0, weight=1)
+        label = ctk.CTkLabel(frame, text=self.text, justify='left', font=self.tooltip_font,
+                             wraplength=self.wraplength, text_color="white")
+        label.grid(column=0, row=0, sticky="nsew", padx=15, pady=15)
+        CreateToolTip.shared_toplevel = toplevel
+        CreateToolTip.shared_label = label
+        return toplevel
 
     def hide_tooltip(self):
         """
-        Hides the tooltip
+        Hides the tooltip if it is still showing this tooltip's text
         """
-        toplevel = self.toplevel
-        self.toplevel = None
-        if toplevel:
-            toplevel.destroy()
+        self.timer = None
+        self.state = _TOOLTIP_IDLE
+        if CreateToolTip.shared_owner is not self:
+            return
+        CreateToolTip.shared_owner = None
+        toplevel = CreateToolTip.shared_toplevel
+        if toplevel is not None and toplevel.winfo_exists():
+            toplevel.withdraw()
 
     def open_url(self, url):
         """
@@ -104,9 +104,7 @@ class CompileUpload(WindowLayout):
         self.details_textbox.grid(column=0, row=4, columnspan=2, **grid_options)
 
         # Hide next and log buttons to start
-        self.next_back.hide_log_button()
-        self.next_back.hide_next()
-        self.next_back.hide_monitor_button()
+        self.next_back.set_visibility(next_button=False, log_button=False, monitor_button=False)
 
         # Hide backup button to start
         self.backup_config_button.grid_remove()
@@ -131,7 +129,7 @@ class CompileUpload(WindowLayout):
                 f"{self.acli.detected_devices[self.acli.selected_device]['matching_boards'][0]['name']} " +
                 f"attached to {self.acli.detected_devices[self.acli.selected_device]['port']}")
         self.intro_label.configure(text=text)
-        local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+        local_repo_dir = pd[self.product]["repo_local_dir"]
         self.install_dir = fm.get_install_dir(local_repo_dir)
         if self.master.advanced_config:
             self.next_back.set_back_text("Advanced Config")
@@ -181,23 +179,19 @@ class CompileUpload(WindowLayout):
             elif self.process_status == "error":
                 self.set_details(self.process_data)
                 self.process_error(self.process_topic)
-                self.next_back.hide_monitor_button()
-                self.next_back.show_next()
-                self.next_back.show_log_button()
+                self.next_back.set_visibility(next_button=True, log_button=True, monitor_button=False)
                 self.show_backup_button()
         elif self.process_phase == "uploading":
             if self.process_status == "success":
                 self.process_stop()
                 self.set_details(self.process_data)
                 self.upload_success()
-                self.next_back.hide_log_button()
-                self.next_back.show_monitor_button()
+                self.next_back.set_visibility(log_button=False, monitor_button=True)
             elif self.process_status == "error":
                 self.process_error(self.process_topic)
                 self.set_details(self.process_data)
                 self.upload_error()
-                self.next_back.hide_monitor_button()
-                self.next_back.show_log_button()
+                self.next_back.set_visibility(log_button=True, monitor_button=False)
             self.next_back.show_next()
             self.show_backup_button()
 
@@ -313,7 +307,7 @@ class CompileUpload(WindowLayout):
         Function to backup config files to the specified folder
         """
         if fm.is_valid_dir(self.backup_path.get()):
-            local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+            local_repo_dir = pd[self.product]["repo_local_dir"]
             install_dir = fm.get_install_dir(local_repo_dir)
             check_list = fm.get_config_files(self.backup_path.get(), pd[self.product]["minimum_config_files"])
             if hasattr(pd[self.product], "other_config_files"):
@@ -80,7 +80,7 @@ class EXCommandStation(WindowLayout):
         # Get the local directory to work in
         self.product = "ex_commandstation"
         self.product_name = pd[self.product]["product_name"]
-        local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+        local_repo_dir = pd[self.product]["repo_local_dir"]
         self.ex_commandstation_dir = fm.get_install_dir(local_repo_dir)
 
         # Variables for version dependent options
@@ -688,14 +688,8 @@ class EXCommandStation(WindowLayout):
         a device name in the dccex_devices dictionary will be removed from the available list when selecting a
         generic Arduino device.
         """
-        restricted_list = []
-        for driver in driver_list:
-            add_driver = driver
-            for device in self.acli.dccex_devices:
-                if self.acli.dccex_devices[device].split("_")[0] == driver.split("_")[0]:
-                    add_driver = None
-            if add_driver is not None:
-                restricted_list.append(add_driver)
+        restricted_list = [driver for driver in driver_list
+                           if driver.split("_")[0] not in self.acli.dccex_device_prefixes]
         return restricted_list
 
     def restrict_dccex_motor_drivers(self, driver_list):
@@ -763,7 +757,7 @@ class EXCommandStation(WindowLayout):
           needed on subsequent passes thru the logic
         """
         file_list = []
-        local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+        local_repo_dir = pd[self.product]["repo_local_dir"]
         product_dir = fm.get_install_dir(local_repo_dir)
         min_list = fm.get_config_files(product_dir, pd[self.product]["minimum_config_files"])
         if min_list:
@@ -48,7 +48,7 @@ class EXTurntable(WindowLayout):
         # Get the local directory to work in
         self.product = "ex_turntable"
         self.product_name = pd[self.product]["product_name"]
-        local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+        local_repo_dir = pd[self.product]["repo_local_dir"]
         self.ex_turntable_dir = fm.get_install_dir(local_repo_dir)
 
         # Set up title
@@ -61,8 +61,7 @@ class EXTurntable(WindowLayout):
                                         product="ex_turntable": parent.switch_view(view, product))
         self.next_back.set_next_text("Compile and load")
         self.next_back.set_next_command(self.generate_config)
-        self.next_back.hide_monitor_button()
-        self.next_back.hide_log_button()
+        self.next_back.set_visibility(log_button=False, monitor_button=False)
 
         # Set up and grid container frames
         self.config_frame = ctk.CTkFrame(self.main_frame, height=360)
@@ -40,6 +40,13 @@ import json
 
 QueueMessage = namedtuple("QueueMessage", ["status", "topic", "data"])
 
+"""
+Cache of config files found by FileManager.get_config_files(), keyed by (directory, patterns)
+
+Each entry holds the directory's modification time so it is found again when files are added, removed, or renamed
+"""
+_config_files_cache = {}
+
 
 class ThreadedDownloader(Thread):
 
@@ -262,6 +269,26 @@ class FileManager:
         This is a valid example of a pattern: r"^my.*\.[^?]*example\.h$|(^my.*\.h$)"  # noqa: W605
         This is an invalid example of a pattern: r"^config\.h$"  # noqa: W605
         This would be valid, but better to just provide filename: r"^(config\.h)$"  # noqa: W605
+
+        Results are cached until the directory is modified, a new list is returned so callers can safely modify it
+        """
+        try:
+            mtime = os.stat(dir).st_mtime_ns
+        except OSError:
+            return False
+        key = (dir, tuple(pattern_list))
+        cached = _config_files_cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return list(cached[1])
+        config_files = FileManager.find_config_files(dir, pattern_list)
+        if config_files is not False:
+            _config_files_cache[key] = (mtime, tuple(config_files))
+        return config_files
+
+    @staticmethod
+    def find_config_files(dir, pattern_list):
+        """
+        Function to search the directory for configuration files, see get_config_files()
         """
         if os.path.exists(dir):
             config_files = []
@@ -3,6 +3,10 @@ Module for a Git client using the pygit2 module
 
 This model enables cloning and selecting versions from GitHub repositories using threads and queues
 
+There is no application wide lock around pygit2, tasks for different repositories run concurrently. A pygit2
+Repository object must not be used by two threads at once, so tasks on the same repository directory are serialised
+by a lock for that directory
+
 © 2024, Peter Cole.
 © 2023, Peter Cole.
 All rights reserved.
@@ -25,14 +29,20 @@ along with CommandStation.  If not, see <https://www.gnu.org/licenses/>.
 
 # Import Python modules
 import pygit2
-from threading import Thread, Lock
+from threading import Lock
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from collections import namedtuple, OrderedDict
 import os
 import re
+import bisect
 import logging
 
 QueueMessage = namedtuple("QueueMessage", ["status", "topic", "data"])
 
+# Shared pool of worker threads for Git tasks, so tasks for different repositories can run at the same time
+_GIT_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="git")
+
 """
 A list of files that should be in .gitignore and therefore can safely be deleted
 
@@ -42,41 +52,89 @@ gitignore_files = [
     ".DS_Store"
 ]
 
+# Pattern for GitHub version tags vX.Y.Z-Prod|Devel
+_VERSION_RE = re.compile(r"v(\d+)\.(\d+)\.(\d+)-(Prod|Devel)")
+
+# Version tags are found by reference name, without creating a Reference object for each
+_VERSION_TAG_PREFIX = "refs/tags/v"
+_TAG_PREFIX_LEN = len("refs/tags/")
+
+"""
+Cache of version tags for each repository, keyed by (repository path, HEAD target)
+
+Entries for a repository are discarded when it is pulled or reset
+"""
+_versions_cache = {}
+
 
-@staticmethod
 def get_exception(error):
     """
     Get an exception into text to add to the queue
     """
-    template = "An exception of type {0} occurred. Arguments:\n{1!r}"
-    message = template.format(type(error).__name__, error.args)
-    return message
+    return f"An exception of type {type(error).__name__} occurred. Arguments:\n{error.args!r}"
 
 
-class ThreadedGitClient(Thread):
-    """
-    Class for running pygit2 tasks in a separate thread
+class ProgressCallbacks(pygit2.RemoteCallbacks):
     """
+    Remote callbacks to report transfer progress to the queue as a "progress" message
 
-    api_lock = Lock()
+    The data is the fraction of objects received (0 to 1), only sent when the whole percentage changes
+    """
 
-    def __init__(self, task_name, task, queue, *args):
+    def __init__(self, queue, task_name):
         super().__init__()
+        self.queue = queue
+        self.task_name = task_name
+        self.percent = -1
+
+    def transfer_progress(self, stats):
+        percent = stats.received_objects * 100 // max(stats.total_objects, 1)
+        if percent != self.percent:
+            self.percent = percent
+            self.queue.put(
+                QueueMessage("progress", self.task_name, percent / 100)
+            )
+
+
+class ThreadedGitClient:
+    """
+    Class for running pygit2 tasks in the Git thread pool
+
+    Tasks on the same repository directory are serialised by a lock per directory, tasks on different
+    repositories run concurrently
+    """
+
+    repo_locks = {}
+
+    def __init__(self, task_name, task, queue, *args, lock_key=None):
         self.task_name = task_name
         self.task = task
         self.queue = queue
         self.args = args
+        self.lock_key = os.path.normcase(os.path.abspath(lock_key)) if lock_key else None
 
         # Set up logger
         self.log = logging.getLogger(__name__)
         self.log.debug("Create instance")
 
-    def run(self, *args, **kwargs):
+    def start(self):
+        """
+        Submit the task to the Git thread pool
+
+        Returns the Future for the running task
+        """
+        return _GIT_POOL.submit(self.run)
+
+    def run(self):
+        task_repr = getattr(self.task, "__qualname__", None) or repr(self.task)
         self.queue.put(
-            QueueMessage("info", self.task_name, f"Run pygit2 task {str(self.task)} with params {self.args}")
+            QueueMessage("info", self.task_name, f"Run pygit2 task {task_repr} with params {self.args}")
         )
-        self.log.debug("Queue info run %s with params %s", str(self.task), self.args)
-        with self.api_lock:
+        self.log.debug("Queue info run %s with params %s", task_repr, self.args)
+        lock = self.repo_locks.get(self.lock_key)
+        if lock is None:
+            lock = self.repo_locks.setdefault(self.lock_key, Lock())
+        with lock:
             try:
                 output = self.task(*self.args)
                 self.queue.put(
@@ -127,14 +185,17 @@ class GitClient:
 
         If file ".DS_Store" is added/modified, this is forcefully discarded as it should be in .gitignore
 
+        Untracked files are listed individually, including those within untracked directories, so ignorable files in
+        any directory are found
+
         Returns False (no changes) or a list of changed files
         """
         file_list = None
         if isinstance(repo, pygit2.Repository):
-            if len(repo.status()) > 0:
+            status = repo.status(untracked_files="all")
+            if len(status) > 0:
                 file_list = []
-                status = repo.status()
-                for file, flag in status.items():
+                for file, flag in list(status.items()):
                     if os.path.basename(file) in gitignore_files and flag == pygit2.GIT_STATUS_WT_NEW:
                         file_path = os.path.join(repo.workdir, file)
                         try:
@@ -143,7 +204,7 @@ class GitClient:
                             GitClient.log.error("Unable to delete file to ignore: %s", file_path)
                         else:
                             GitClient.log.info("File to ignore found and discarded: %s", file_path)
-                status = repo.status()
+                            del status[file]
                 if len(status) > 0:
                     for file, flag in status.items():
                         change = "Unknown"
@@ -168,26 +229,22 @@ class GitClient:
         """
         Check if directory exists and contains a .git file
 
+        ".git" may be a directory or a file (worktrees), and can only exist if the directory itself does
+
         Returns True if so, False if not
         """
-        git_file = os.path.join(dir, ".git")
-        if os.path.exists(dir) and os.path.isdir(dir):
-            if os.path.exists(git_file):
-                return True
-            else:
-                return False
-        else:
-            return False
+        return os.path.lexists(os.path.join(dir, ".git"))
 
     @staticmethod
     def clone_repo(repo_url, repo_dir, queue):
         """
         Clone a remote repo using a separate thread
 
-        Returns the repo instance in queue data if successful
+        Returns the repo instance in queue data if successful, progress is reported with "progress" messages
         """
         task_name = "clone_repo"
-        thread = ThreadedGitClient(task_name, pygit2.clone_repository, queue, repo_url, repo_dir)
+        task = partial(pygit2.clone_repository, callbacks=ProgressCallbacks(queue, task_name))
+        thread = ThreadedGitClient(task_name, task, queue, repo_url, repo_dir, lock_key=repo_dir)
         thread.start()
 
     @staticmethod
@@ -198,6 +255,7 @@ class GitClient:
         Expects a pygit2 repo object and a branch name
         """
         GitClient.log.debug("Pull latest updates from %s, branch %s", remote_name, branch)
+        GitClient.clear_versions_cache(repo)
         for remote in repo.remotes:
             if remote.name == remote_name:
                 remote.fetch()
@@ -225,16 +283,30 @@ class GitClient:
                     return False
 
     @staticmethod
-    def pull_latest(repo, branch, queue):
+    def checkout_pull(repo, remote_name="origin", branch="master"):
+        """
+        Function to checkout the provided branch and then pull the latest updates for it
+
+        Expects a pygit2 repo object and a branch name
+        """
+        branch_ref = GitClient.get_branch_ref(repo, branch)
+        GitClient.log.debug("Checkout %s", branch)
+        repo.checkout(refname=branch_ref)
+        return GitClient.pull(repo, remote_name, branch)
+
+    @staticmethod
+    def pull_latest(repo, branch, queue, checkout=False):
         """
         Pull latest updates from a repo
 
-        Threaded version of pull
+        Threaded version of pull, or of checkout_pull if checkout is True so the branch checkout also happens in
+        the Git thread pool
 
         Requires a pygit2 repo object and a branch name
         """
         task_name = "pull"
-        thread = ThreadedGitClient(task_name, GitClient.pull, queue, repo, "origin", branch)
+        task = GitClient.checkout_pull if checkout else GitClient.pull
+        thread = ThreadedGitClient(task_name, task, queue, repo, "origin", branch, lock_key=repo.workdir)
         thread.start()
 
     @staticmethod
@@ -253,30 +325,46 @@ class GitClient:
         Gets all version tags from the specified repo
 
         Returns either an ordered dictionary (descending) or False if there are no tags
+
+        Results are cached until HEAD changes or the repository is pulled or reset, a copy is returned so callers
+        can safely modify it
         """
-        versions_unsorted = {}
-        version_list = {}
-        version_match = r"v(\d+)\.(\d+)\.(\d+)-(Prod|Devel)"
-        refs = repo.references.iterator(2)
-        for ref in refs:
-            version = re.search(version_match, ref.shorthand)
+        key = (repo.path, str(repo.head.target))
+        cached = _versions_cache.get(key)
+        if cached is not None:
+            return OrderedDict(cached)
+        # Keys are negated so the newest version sorts first
+        sorted_keys = []
+        versions = {}
+        for name in repo.listall_references():
+            if not name.startswith(_VERSION_TAG_PREFIX):
+                continue
+            shorthand = name[_TAG_PREFIX_LEN:]
+            version = _VERSION_RE.match(shorthand)
             if version:
-                numbers = {"major": int(version[1]),
-                           "minor": int(version[2]),
-                           "patch": int(version[3]),
-                           "type": version[4],
-                           "ref": ref.name}
-                versions_unsorted[ref.shorthand] = numbers
-                version_list = OrderedDict(sorted(versions_unsorted.items(),
-                                           key=lambda t: (t[1]["major"],
-                                                          t[1]["minor"],
-                                                          t[1]["patch"]),
-                                           reverse=True))
+                major, minor, patch = int(version[1]), int(version[2]), int(version[3])
+                versions[shorthand] = {"major": major,
+                                       "minor": minor,
+                                       "patch": patch,
+                                       "type": version[4],
+                                       "ref": name}
+                bisect.insort_left(sorted_keys, (-major, -minor, -patch, shorthand))
+        version_list = OrderedDict((key[3], versions[key[3]]) for key in sorted_keys)
         if len(version_list.keys()) > 0:
             GitClient.log.debug("Tag list: %s", version_list)
         else:
             GitClient.log.error("No tags available for repository")
-        return version_list
+        _versions_cache[key] = version_list
+        return OrderedDict(version_list)
+
+    @staticmethod
+    def clear_versions_cache(repo):
+        """
+        Discard any cached version tags for the provided repo
+        """
+        for key in list(_versions_cache):
+            if key[0] == repo.path:
+                _versions_cache.pop(key, None)
 
     @staticmethod
     def extract_version_details(version_string):
@@ -288,54 +376,63 @@ class GitClient:
         version_string must match a GitHub version style tag to work
         vX.Y.Z-Prod|Devel
         """
-        version_match = r"v(\d+)\.(\d+)\.(\d+)-(Prod|Devel)"
-        version = re.search(version_match, version_string)
-        if version:
-            return (int(version[1]), int(version[2]), int(version[3]))
-        else:
-            return (None, None, None)
+        version = _VERSION_RE.match(version_string)
+        return (int(version[1]), int(version[2]), int(version[3])) if version else (None, None, None)
+
+    @staticmethod
+    def get_latest(repo):
+        """
+        Retrieves the latest Production and Development tagged versions from the repo in a single pass
+
+        Returns a dictionary {"Prod": (version, ref) | None, "Devel": (version, ref) | None}
+        """
+        prod, devel, _ = GitClient.get_all_versions(repo)
+        return {"Prod": prod, "Devel": devel}
+
+    @staticmethod
+    def get_all_versions(repo):
+        """
+        Retrieves the latest Production and Development tagged versions along with all versions from the repo
+
+        Returns a tuple (prod, devel, versions) where prod and devel are (version, ref) or None, and versions is
+        the ordered dictionary from get_repo_versions()
+        """
+        latest = {"Prod": None, "Devel": None}
+        version_list = GitClient.get_repo_versions(repo)
+        for version, details in version_list.items():
+            if latest[details["type"]] is None:
+                latest[details["type"]] = (version, details["ref"])
+                if latest["Prod"] and latest["Devel"]:
+                    break
+        GitClient.log.debug("Latest versions are %s", latest)
+        return latest["Prod"], latest["Devel"], version_list
 
     @staticmethod
     def get_latest_prod(repo, tag_name="Prod"):
         """
         Retrieves the latest Production tagged version from the repo
 
-        If no tags or no Prod tags, returns False
+        If no tags or no Prod tags, returns None
         """
-        prod_version = None
-        version_list = GitClient.get_repo_versions(repo)
-        for version in version_list:
-            if version_list[version]["type"] == "Prod":
-                prod_version = (version, version_list[version]["ref"])
-                break
-        GitClient.log.debug("Latest production is %s", prod_version)
-        return prod_version
+        return GitClient.get_latest(repo)["Prod"]
 
     @staticmethod
     def get_latest_devel(repo, tag_name="Devel"):
         """
         Retrieves the latest Development tagged version from the repo
 
-        If no tags or no Devel tags, returns False
+        If no tags or no Devel tags, returns None
         """
-        devel_version = None
-        version_list = GitClient.get_repo_versions(repo)
-        for version in version_list:
-            if version_list[version]["type"] == "Devel":
-                devel_version = (version, version_list[version]["ref"])
-                break
-        GitClient.log.debug("Lastest development is %s", devel_version)
-        return devel_version
+        return GitClient.get_latest(repo)["Devel"]
 
     @staticmethod
     def git_hard_reset(repo):
         """
         Performs a hard reset of the provided repository to the current HEAD
+
+        Untracked files that aren't ignored are removed by libgit2 as part of a forced checkout
         """
         if isinstance(repo, pygit2.Repository):
-            status = repo.status()
-            for file, flag in status.items():
-                if flag == pygit2.GIT_STATUS_WT_NEW:
-                    file_path = os.path.join(repo.workdir, file)
-                    os.remove(file_path)
+            GitClient.clear_versions_cache(repo)
+            repo.checkout_head(strategy=pygit2.GIT_CHECKOUT_FORCE | pygit2.GIT_CHECKOUT_REMOVE_UNTRACKED)
             repo.reset(repo.head.peel().oid, pygit2.GIT_RESET_HARD)
@@ -623,9 +623,9 @@ class ManageArduinoCLI(WindowLayout):
         """
         Method to process installing all required packages.
 
-        This needs to cycle through each package to install them.
+        All packages still to be installed are installed with a single Arduino CLI command.
 
-        If we need to start, call _install_single_package().
+        If we need to start, call _install_pending_packages().
 
         Any other status is an error.
         """
@@ -637,31 +637,29 @@ class ManageArduinoCLI(WindowLayout):
             (self.process_status == "start" and install_count > 0) or
             (install_count > 0 and self.process_status == "success")
         ):
-            # Iterate through the list of platform packages to get the next to install
-            for platform_name, platform_details in self.packages_to_install.items():
-                if platform_details["state"] == "not_installed" and platform_details["selection"] == "on":
-                    package_name = platform_name
-                    platform_id = platform_details["platform_id"]
-                    version = platform_details["version"]
-                    break
-            self._install_single_package(package_name, platform_id, version)
+            self._install_pending_packages()
         elif self.process_status == "success" or (self.process_status == "start" and install_count == 0):
             self.process_status = "start"
             self._install_libraries()
         else:
             self._process_error()
 
-    def _install_single_package(self, package_name, platform_id, version):
+    def _install_pending_packages(self):
         """
-        Method to start installing the specified package.
+        Method to start installing all packages still to be installed.
 
-        We flag the package as installed here to prevent an endless loop, but this should be improved in future.
+        We flag the packages as installed here to prevent an endless loop, but this should be improved in future.
         """
-        package = platform_id + "@" + version
-        self.packages_to_install[package_name]["state"] = "installed"
-        self.log.debug(f"_install_single_package() {self.process_status}\npackage_name: {package}, package: {package}")
-        self.process_start("install_packages", f"Installing package {package_name}", "Manage_CLI")
-        self.acli.install_package(self.acli.cli_file_path(), package, self.queue)
+        package_names = []
+        packages = []
+        for platform_name, platform_details in self.packages_to_install.items():
+            if platform_details["state"] == "not_installed" and platform_details["selection"] == "on":
+                package_names.append(platform_name)
+                packages.append(platform_details["platform_id"] + "@" + platform_details["version"])
+                platform_details["state"] = "installed"
+        self.log.debug(f"_install_pending_packages() {self.process_status}\npackages: {packages}")
+        self.process_start("install_packages", f"Installing packages {', '.join(package_names)}", "Manage_CLI")
+        self.acli.install_packages(self.acli.cli_file_path(), packages, self.queue)
 
     def _get_library_install_count(self):
         """
@@ -680,9 +678,9 @@ class ManageArduinoCLI(WindowLayout):
         """
         Method to start installing the required libraries.
 
-        This needs to cycle through each library to install them.
+        All libraries still to be installed are installed with a single Arduino CLI command.
 
-        If we need to start, call _install_single_library().
+        If we need to start, call _install_pending_libraries().
 
         Any other status is an error.
         """
@@ -694,30 +692,27 @@ class ManageArduinoCLI(WindowLayout):
             (self.process_status == "start" and install_count > 0) or
             (install_count > 0 and self.process_status == "success")
         ):
-            # Iterate through the libraries and get the next to install
-            for library, library_details in self.libraries_to_install.items():
-                if library_details["state"] == "not_installed":
-                    library_name = library
-                    version = library_details["version"]
-                    break
-            self._install_single_library(library_name, version)
+            self._install_pending_libraries()
         elif self.process_status == "success" or (self.process_status == "start" and install_count == 0):
             self.process_status = "start"
             self._refresh_boards()
         else:
             self._process_error()
 
-    def _install_single_library(self, library_name, version):
+    def _install_pending_libraries(self):
         """
-        Method to start installing the specified library.
+        Method to start installing all libraries still to be installed.
 
-        Flag the library as installed here but that should be validated in a later version.
+        Flag the libraries as installed here but that should be validated in a later version.
         """
-        library = library_name + "@" + version
-        self.libraries_to_install[library_name]["state"] = "installed"
-        self.log.debug(f"_install_single_library() {self.process_status}\nlibrary: {library}, version: {version}")
-        self.process_start("install_libraries", "Install Arduino library " + library, "Manage_CLI")
-        self.acli.install_library(self.acli.cli_file_path(), library, self.queue)
+        libraries = []
+        for library_name, library_details in self.libraries_to_install.items():
+            if library_details["state"] == "not_installed":
+                libraries.append(library_name + "@" + library_details["version"])
+                library_details["state"] = "installed"
+        self.log.debug(f"_install_pending_libraries() {self.process_status}\nlibraries: {libraries}")
+        self.process_start("install_libraries", "Install Arduino libraries " + ", ".join(libraries), "Manage_CLI")
+        self.acli.install_libraries(self.acli.cli_file_path(), libraries, self.queue)
 
     def _refresh_boards(self):
         """
@@ -732,7 +727,7 @@ class ManageArduinoCLI(WindowLayout):
         self.log.debug(f"_refresh_boards() {self.process_status}")
         if self.process_status == "start":
             self.process_start("refresh_boards", "Refreshing Arduino CLI board list", "Manage_CLI")
-            self.acli.list_boards(self.acli.cli_file_path(), self.queue)
+            self.acli.list_boards(self.acli.cli_file_path(), self.queue, raw=True)
         elif self.process_status == "success":
             self._process_finished()
         else:
@@ -77,3 +77,8 @@ product_details = {
         ]
     }
 }
+
+# Local directory name for each product's repository, the repository name without the owner
+for _details in product_details.values():
+    _details["repo_local_dir"] = _details["repo_name"].split("/", 1)[1]
+del _details
@@ -99,6 +99,12 @@ class SelectDevice(WindowLayout):
         self.device_list_frame.grid_rowconfigure(0, weight=1)
         self.selected_device = ctk.IntVar(self, value=-1)
 
+        # Serial port details by device, filled when first needed after each refresh
+        self.port_cache = None
+
+        # Pool of device row widgets, reused on each refresh
+        self.device_rows = []
+
         # Create detected device label and grid
         grid_options = {"padx": 5, "pady": 5}
         self.no_device_label = ctk.CTkLabel(self.select_device_frame, text="Scanning for devices",
@@ -121,7 +127,8 @@ class SelectDevice(WindowLayout):
         self.list_device_button.grid(column=0, row=2)
 
         self.set_state()
-        self.list_devices("list_devices")
+        # Let the window draw with "Scanning for devices" before the first scan is started
+        self.after_idle(self.list_devices, "list_devices")
 
     def set_state(self):
         self.next_back.hide_log_button()
@@ -155,12 +162,16 @@ class SelectDevice(WindowLayout):
             self.log.debug("List devices button clicked")
             self.acli.detected_devices.clear()
             self.acli.selected_device = None
-            for widget in self.device_list_frame.winfo_children():
-                widget.destroy()
+            for device_row in self.device_rows:
+                device_row["radio_button"].grid_remove()
+                if device_row["combo"] is not None:
+                    device_row["combo"].grid_remove()
             self.process_start("refresh_list", "Scanning for attached devices", "List_Devices")
             self.acli.list_boards(self.acli.cli_file_path(), self.queue)
         elif self.process_phase == "refresh_list":
             if self.process_status == "success":
+                # Serial ports are only enumerated once per refresh, and only if an unknown device needs them
+                self.port_cache = None
                 # Arduino CLI 1.0.0 adds the list as a value to a dict, need to reset that to just a list
                 if len(self.process_data) > 0 and "detected_ports" in self.process_data:
                     if isinstance(self.process_data["detected_ports"], list):
@@ -175,10 +186,7 @@ class SelectDevice(WindowLayout):
                                   'protocol_label': 'Serial Port (USB)'}}]
                     self.process_data = fake_data
                 if isinstance(self.process_data, list) and len(self.process_data) > 0:
-                    supported_boards = []
-                    for board in self.acli.supported_devices:
-                        supported_boards.append(board)
-                    grid_options = {"padx": 5, "pady": 5}
+                    supported_boards = list(self.acli.supported_devices)
                     for board in self.process_data:
                         matching_board_list = []
                         port = board["port"]["address"]
@@ -195,52 +203,41 @@ class SelectDevice(WindowLayout):
                         self.acli.detected_devices.append({"port": port, "matching_boards": matching_board_list})
                         self.log.debug("Found device list")
                         self.log.debug(self.acli.detected_devices)
+                    device_rows = tuple(range(1, len(self.acli.detected_devices) + 1))
+                    self.device_list_frame.grid_rowconfigure(device_rows, weight=1)
                     for index, item in enumerate(self.acli.detected_devices):
                         text = None
                         tip = None
-                        row = index + 1
-                        self.device_list_frame.grid_rowconfigure(row, weight=1)
+                        device_row = self.get_device_row(index)
                         self.log.debug("Process %s at index %s", item, index)
-                        if len(self.acli.detected_devices[index]["matching_boards"]) > 1:
-                            matched_boards = []
-                            for matched_board in self.acli.detected_devices[index]["matching_boards"]:
-                                matched_boards.append(matched_board["name"])
-                            multi_combo = ctk.CTkComboBox(self.device_list_frame,
-                                                          values="Select the correct device", width=250,
-                                                          command=lambda name, i=index: self.update_board(name, i))
-                            multi_combo.grid(column=1, row=row, sticky="e", **grid_options)
-                            multi_combo.configure(values=matched_boards)
-                            text = "Multiple matches detected"
-                            text += " on " + self.acli.detected_devices[index]["port"]
+                        boards = item["matching_boards"]
+                        first_name = boards[0]["name"]
+                        port = item["port"]
+                        if len(boards) > 1:
+                            matched_boards = [matched_board["name"] for matched_board in boards]
+                            self.show_device_combo(device_row, index, matched_boards)
+                            text = f"Multiple matches detected on {port}"
                             tip = multi_device_tip
-                            self.log.debug("Multiple matched devices on %s", self.acli.detected_devices[index]["port"])
-                            self.log.debug(self.acli.detected_devices[index]["matching_boards"])
-                        elif self.acli.detected_devices[index]["matching_boards"][0]["name"] == "Unknown":
-                            unknown_combo = ctk.CTkComboBox(self.device_list_frame,
-                                                            values=["Select the correct device"], width=250,
-                                                            command=lambda name, i=index: self.update_board(name, i))
-                            unknown_combo.grid(column=1, row=row, sticky="e", **grid_options)
-                            unknown_combo.configure(values=supported_boards)
-                            port_description = self.get_port_description(self.acli.detected_devices[index]["port"])
+                            self.log.debug("Multiple matched devices on %s", port)
+                            self.log.debug(boards)
+                        elif first_name == "Unknown":
+                            self.show_device_combo(device_row, index, supported_boards)
+                            port_description = self.get_port_description(port)
                             if port_description:
                                 text = f"Unknown/clone detected as {port_description}"
                             else:
-                                text = ("Unknown or clone device detected on " +
-                                        self.acli.detected_devices[index]['port'])
+                                text = f"Unknown or clone device detected on {port}"
                             tip = unknown_device_tip
-                            self.log.debug("Unknown or clone device on %s", self.acli.detected_devices[index]["port"])
+                            self.log.debug("Unknown or clone device on %s", port)
                         else:
-                            text = self.acli.detected_devices[index]["matching_boards"][0]["name"]
-                            text += " on " + self.acli.detected_devices[index]["port"]
-                            self.log.debug("%s on %s", self.acli.detected_devices[index]["matching_boards"][0]["name"],
-                                           self.acli.detected_devices[index]["port"])
+                            if device_row["combo"] is not None:
+                                device_row["combo"].grid_remove()
+                            text = f"{first_name} on {port}"
+                            self.log.debug("%s on %s", first_name, port)
                             self.select_device()
-                        radio_button = ctk.CTkRadioButton(self.device_list_frame, text=text,
-                                                          variable=self.selected_device, value=index,
-                                                          command=self.select_device)
-                        if tip is not None:
-                            CreateToolTip(radio_button, tip)
-                        radio_button.grid(column=0, row=row, sticky="w", **grid_options)
+                        device_row["radio_button"].configure(text=text)
+                        device_row["radio_button"].grid()
+                        device_row["tooltip"].text = tip
                 else:
                     self.no_device_label.configure(text="No devices found")
                 self.set_state()
@@ -248,6 +245,44 @@ class SelectDevice(WindowLayout):
             elif self.process_status == "error":
                 self.process_error(self.process_topic)
 
+    def get_device_row(self, index):
+        """
+        Get the widgets for the device row at the provided index, creating them if the pool doesn't have it yet
+
+        Each row is a dictionary of the radio button, its tooltip, and the combobox (created when first needed)
+        """
+        if index < len(self.device_rows):
+            return self.device_rows[index]
+        radio_button = ctk.CTkRadioButton(self.device_list_frame, text=None,
+                                          variable=self.selected_device, value=index,
+                                          command=self.select_device)
+        radio_button.grid(column=0, row=index + 1, sticky="w", padx=5, pady=5)
+        device_row = {
+            "radio_button": radio_button,
+            "tooltip": CreateToolTip(radio_button, None),
+            "combo": None,
+            "values": None
+        }
+        self.device_rows.append(device_row)
+        return device_row
+
+    def show_device_combo(self, device_row, index, values):
+        """
+        Show the combobox for the device row with the provided values, only reconfiguring the values if changed
+        """
+        combo = device_row["combo"]
+        if combo is None:
+            combo = ctk.CTkComboBox(self.device_list_frame, values=values, width=250,
+                                    command=lambda name, i=index: self.update_board(name, i))
+            combo.grid(column=1, row=index + 1, sticky="e", padx=5, pady=5)
+            device_row["combo"] = combo
+        else:
+            if values != device_row["values"]:
+                combo.configure(values=values)
+            combo.grid()
+        device_row["values"] = values
+        combo.set("Select the correct device")
+
     def update_board(self, name, index):
         if name != "Select the correct device":
             if name.startswith("DCC-EX"):
@@ -284,13 +319,13 @@ class SelectDevice(WindowLayout):
         Function to obtain USB/serial port descriptions using pyserial for ports the CLI doesn't identify
         """
         description = False
-        port_list = serial.tools.list_ports.comports()
-        if isinstance(port_list, list):
-            for port in port_list:
-                if port.device == unknown_port:
-                    if port.product is not None:
-                        description = f" {port.product} ({port.device})"
-                    else:
-                        description = port.description
-                    break
+        if self.port_cache is None:
+            port_list = serial.tools.list_ports.comports()
+            self.port_cache = {port.device: port for port in port_list} if isinstance(port_list, list) else {}
+        port = self.port_cache.get(unknown_port)
+        if port is not None:
+            if port.product is not None:
+                description = f" {port.product} ({port.device})"
+            else:
+                description = port.description
         return description
@@ -53,8 +53,7 @@ class SelectProduct(WindowLayout):
         # Set next/back buttons
         self.next_back.set_back_text("Select Device")
         self.next_back.set_back_command(lambda view="select_device": parent.switch_view(view))
-        self.next_back.hide_next()
-        self.next_back.hide_monitor_button()
+        self.next_back.set_visibility(next_button=False, monitor_button=False)
 
         # Set up and configure the container frame
         self.select_product_frame = ctk.CTkFrame(self.main_frame, height=360)
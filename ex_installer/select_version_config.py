@@ -27,6 +27,9 @@ along with CommandStation.  If not, see <https://www.gnu.org/licenses/>.
 import customtkinter as ctk
 import os
 import logging
+from functools import partial
+from types import MappingProxyType
+from enum import IntEnum
 from CTkMessagebox import CTkMessagebox
 
 # Import local modules
@@ -35,6 +38,36 @@ from .product_details import product_details as pd
 from .file_manager import FileManager as fm
 
 
+class LocalRepoState(IntEnum):
+    """
+    Steps to set up the local repository, see SelectVersionConfig.setup_local_repo()
+    """
+    SETUP = 1
+    CLONE = 2
+    CLONE_COMPLETE = 3
+    GET_LATEST = 4
+    PULL_COMPLETE = 5
+
+
+# Number of versions offered in the version combobox until all versions are asked for
+_VERSION_COMBO_LIMIT = 50
+_SHOW_ALL_VERSIONS = "Show all..."
+
+# Combobox entry to checkout the devel branch, added after the version tags
+_DEVEL_BRANCH_VERSION = "v9.9.9-Devel devel branch"
+_DEVEL_SENTINEL = MappingProxyType({"major": 9, "minor": 9, "patch": 9, "type": "Devel", "ref": "origin/devel"})
+
+# Version radio buttons as (attribute, text, value, bold), the value is also the grid row
+_VERSION_RADIOS = (
+    ("latest_prod_radio", "Latest Production - Recommended!", 0, True),
+    ("latest_devel_radio", "Latest Development", 1, False),
+    ("select_version_radio", "Select a specific version", 2, False)
+)
+
+# Padding used when laying out widgets
+_GRID_OPTIONS = MappingProxyType({"padx": 5, "pady": 5})
+
+
 class SelectVersionConfig(WindowLayout):
     """
     Class for selecting the version and config directory
@@ -45,6 +78,18 @@ class SelectVersionConfig(WindowLayout):
                     "install other versions if you know what you're doing, or if a version has been suggested by " +
                     "the DCC-EX team.")
 
+    # Bold font for the recommended version, created once when first needed
+    _bold_font = None
+
+    @classmethod
+    def get_bold_font(cls):
+        """
+        Get the bold font shared by all instances
+        """
+        if cls._bold_font is None:
+            cls._bold_font = ctk.CTkFont(weight="bold")
+        return cls._bold_font
+
     def __init__(self, parent, *args, **kwargs):
         """
         Initialise view
@@ -66,6 +111,10 @@ class SelectVersionConfig(WindowLayout):
 
         # Define variables
         self.product = None
+        self.product_details = None
+        self.product_name = None
+        self.minimum_config_files = None
+        self.other_config_files = None
         self.install_dir = None
         self.branch_name = None
         self.repo = None
@@ -74,14 +123,22 @@ class SelectVersionConfig(WindowLayout):
         self.latest_devel = None
         self.product_dir = None
 
+        # Steps to set up the local repository, see setup_local_repo()
+        self.local_repo_states = {
+            LocalRepoState.SETUP: self.check_local_repo,
+            LocalRepoState.CLONE: self.start_clone,
+            LocalRepoState.CLONE_COMPLETE: self.clone_complete,
+            LocalRepoState.GET_LATEST: self.get_latest,
+            LocalRepoState.PULL_COMPLETE: self.pull_complete
+        }
+
         # Set up next/back buttons
         self.next_back.set_back_text("Select Product")
         self.next_back.set_back_command(lambda view="select_product": parent.switch_view(view))
         self.next_back.set_next_text("Configuration")
         self.next_back.set_next_command(None)
         self.next_back.disable_next()
-        self.next_back.hide_log_button()
-        self.next_back.hide_monitor_button()
+        self.next_back.set_visibility(log_button=False, monitor_button=False)
 
         # Set up and grid container frame
         self.version_frame = ctk.CTkFrame(self.main_frame, height=360)
@@ -95,16 +152,18 @@ class SelectVersionConfig(WindowLayout):
         Function to set the product details to manage the repository
         """
         self.product = product
-        self.set_title_text(f"Select {pd[self.product]['product_name']} version")
-        self.set_title_logo(pd[product]["product_logo"])
-        local_repo_dir = pd[self.product]["repo_name"].split("/")[1]
+        self.product_details = pd[product]
+        self.product_name = self.product_details["product_name"]
+        self.minimum_config_files = self.product_details["minimum_config_files"]
+        self.other_config_files = self.product_details.get("other_config_files")
+        self.set_title_text(f"Select {self.product_name} version")
+        self.set_title_logo(self.product_details["product_logo"])
+        local_repo_dir = self.product_details["repo_local_dir"]
         self.product_dir = fm.get_install_dir(local_repo_dir)
-        self.branch_name = pd[self.product]["default_branch"]
-        self.setup_local_repo("setup_local_repo")
+        self.branch_name = self.product_details["default_branch"]
+        self.setup_local_repo(LocalRepoState.SETUP)
 
     def setup_version_frame(self):
-        grid_options = {"padx": 5, "pady": 5}
-
         # Set up version instructions
         self.version_label = ctk.CTkLabel(self.version_frame, text=self.version_text,
                                           wraplength=780, font=self.instruction_font)
@@ -117,24 +176,17 @@ class SelectVersionConfig(WindowLayout):
         self.version_radio_frame.grid_rowconfigure((0, 1, 2, 3, 4, 5), weight=1)
 
         self.select_version = ctk.IntVar(value=0)
-        self.latest_prod_radio = ctk.CTkRadioButton(self.version_radio_frame, variable=self.select_version,
-                                                    text="Latest Production - Recommended!",
-                                                    font=ctk.CTkFont(weight="bold"), value=0,
-                                                    command=self.set_version)
-        self.latest_devel_radio = ctk.CTkRadioButton(self.version_radio_frame, variable=self.select_version,
-                                                     text="Latest Development", value=1,
-                                                     command=self.set_version)
-        self.select_version_radio = ctk.CTkRadioButton(self.version_radio_frame, variable=self.select_version,
-                                                       text="Select a specific version", value=2,
-                                                       command=self.set_version)
+        for attribute, text, value, bold in _VERSION_RADIOS:
+            radio = ctk.CTkRadioButton(self.version_radio_frame, variable=self.select_version, text=text, value=value,
+                                       font=self.get_bold_font() if bold else None, command=self.set_version)
+            # The specific version radio shares its row with the version combobox
+            radio.grid(column=0, row=value, columnspan=1 if value == 2 else 2, sticky="w", **_GRID_OPTIONS)
+            setattr(self, attribute, radio)
         self.select_version_combo = ctk.CTkComboBox(self.version_radio_frame, values=["Select a version"], width=150,
                                                     command=self.set_select_version)
 
         # Layout radio frame
-        self.latest_prod_radio.grid(column=0, row=0, columnspan=2, sticky="w", **grid_options)
-        self.latest_devel_radio.grid(column=0, row=1, columnspan=2, sticky="w", **grid_options)
-        self.select_version_radio.grid(column=0, row=2, sticky="w", **grid_options)
-        self.select_version_combo.grid(column=1, row=2, sticky="e", **grid_options)
+        self.select_version_combo.grid(column=1, row=2, sticky="e", **_GRID_OPTIONS)
 
         # Set up configuration options
         self.config_radio_frame = ctk.CTkFrame(self.version_frame)
@@ -154,17 +206,17 @@ class SelectVersionConfig(WindowLayout):
         # Configure and layout config frame
         self.config_radio_frame.grid_columnconfigure((0, 1), weight=1)
         self.config_radio_frame.grid_rowconfigure((0, 1), weight=1)
-        self.configure_radio.grid(column=0, row=0, columnspan=3, sticky="w", **grid_options)
-        self.use_config_radio.grid(column=0, row=1, sticky="w", **grid_options)
-        self.config_file_entry.grid(column=1, row=1, **grid_options)
-        self.browse_button.grid(column=2, row=1, sticky="w", **grid_options)
+        self.configure_radio.grid(column=0, row=0, columnspan=3, sticky="w", **_GRID_OPTIONS)
+        self.use_config_radio.grid(column=0, row=1, sticky="w", **_GRID_OPTIONS)
+        self.config_file_entry.grid(column=1, row=1, **_GRID_OPTIONS)
+        self.browse_button.grid(column=2, row=1, sticky="w", **_GRID_OPTIONS)
 
         # Configure and layout version frame
         self.version_frame.grid_columnconfigure(0, weight=1)
         self.version_frame.grid_rowconfigure((0, 1, 2), weight=1)
-        self.version_label.grid(column=0, row=0, **grid_options)
-        self.version_radio_frame.grid(column=0, row=1, **grid_options)
-        self.config_radio_frame.grid(column=0, row=2, **grid_options)
+        self.version_label.grid(column=0, row=0, **_GRID_OPTIONS)
+        self.version_radio_frame.grid(column=0, row=1, **_GRID_OPTIONS)
+        self.config_radio_frame.grid(column=0, row=2, **_GRID_OPTIONS)
 
     def setup_local_repo(self, event):
         """
@@ -180,59 +232,85 @@ class SelectVersionConfig(WindowLayout):
             
         - if not, clone repo
         - get list of versions, latest prod, and latest devel versions
+
+        Each step is a handler in local_repo_states returning the next state, or None to wait for the next
+        <<Setup_Local_Repo>> event. Processes are started with the state to continue with as their phase, so the
+        event continues from there
         """
-        if event == "setup_local_repo":
-            self.log.debug("Setting up local repository")
-            self.delete_config_files()
-            if os.path.exists(self.product_dir) and os.path.isdir(self.product_dir):
-                if self.git.dir_is_git_repo(self.product_dir):
-                    self.repo = self.git.get_repo(self.product_dir)
-                    if self.repo:
-                        changes = self.git.check_local_changes(self.repo)
-                        if changes:
-                            self.process_error("Local changes have been detected that require resolution")
-                            self.log.error("Local repository file changes: %s", changes)
-                            self.resolve_local_changes(changes)
-                        else:
-                            self.setup_local_repo("get_latest")
-                    else:
-                        self.process_error(f"{self.product_dir} appears to be a Git repository but is not")
-                else:
-                    if fm.dir_is_empty(self.product_dir):
-                        self.setup_local_repo("clone_repo")
-                    else:
-                        self.process_error(f"{self.product_dir} contains files but is not a repo")
-            else:
-                self.log.debug("Cloning repository")
-                self.setup_local_repo("clone_repo")
-        elif event == "clone_repo":
-            self.process_start("clone_repo", "Clone repository", "Setup_Local_Repo")
-            self.git.clone_repo(pd[self.product]["repo_url"], self.product_dir, self.queue)
-        elif self.process_phase == "clone_repo" or event == "get_latest":
-            if self.process_status == "success" or event == "get_latest":
-                self.repo = self.git.get_repo(self.product_dir)
-                branch_ref = self.git.get_branch_ref(self.repo, self.branch_name)
-                self.log.debug("Checkout %s", self.branch_name)
-                try:
-                    self.repo.checkout(refname=branch_ref)
-                except Exception as error:
-                    message = self.get_exception(error)
-                    self.process_error(message)
-                    self.log.error(message)
-                else:
-                    self.process_start("pull_latest", "Get latest software updates", "Setup_Local_Repo")
-                    self.git.pull_latest(self.repo, self.branch_name, self.queue)
-            elif self.process_status == "error":
-                self.process_error(self.process_data)
-                self.log.error(self.process_data)
-        elif self.process_phase == "pull_latest":
-            if self.process_status == "success":
-                self.set_versions(self.repo)
-                self.process_stop()
-                self.set_next_config()
-            elif self.process_status == "error":
-                self.process_error("Could not pull latest updates from GitHub")
-                self.log.error("Could not pull updates from GitHub")
+        if isinstance(event, LocalRepoState):
+            state = event
+        else:
+            state = self.process_phase
+        while state is not None:
+            state = self.local_repo_states[state]()
+
+    def check_local_repo(self):
+        """
+        Check the state of the product directory and decide whether to clone or update it
+        """
+        self.log.debug("Setting up local repository")
+        if not os.path.isdir(self.product_dir):
+            self.log.debug("Cloning repository")
+            return LocalRepoState.CLONE
+        if not self.git.dir_is_git_repo(self.product_dir):
+            if fm.dir_is_empty(self.product_dir):
+                return LocalRepoState.CLONE
+            self.process_error(f"{self.product_dir} contains files but is not a repo")
+            return None
+        # Only an existing repo can contain config files from a previous pass
+        self.delete_config_files()
+        self.repo = self.git.get_repo(self.product_dir)
+        if not self.repo:
+            self.process_error(f"{self.product_dir} appears to be a Git repository but is not")
+            return None
+        changes = self.git.check_local_changes(self.repo)
+        if changes:
+            self.process_error("Local changes have been detected that require resolution")
+            self.log.error("Local repository file changes: %s", changes)
+            self.resolve_local_changes(changes)
+            return None
+        return LocalRepoState.GET_LATEST
+
+    def start_clone(self):
+        """
+        Start cloning the product repository
+        """
+        self.process_start(LocalRepoState.CLONE_COMPLETE, "Clone repository", "Setup_Local_Repo")
+        self.git.clone_repo(self.product_details["repo_url"], self.product_dir, self.queue)
+        return None
+
+    def clone_complete(self):
+        """
+        Continue with the latest updates once cloning has finished
+        """
+        if self.process_status == "success":
+            return LocalRepoState.GET_LATEST
+        if self.process_status == "error":
+            self.process_error(self.process_data)
+            self.log.error(self.process_data)
+        return None
+
+    def get_latest(self):
+        """
+        Start checking out the default branch and pulling the latest updates in the background
+        """
+        self.repo = self.git.get_repo(self.product_dir)
+        self.process_start(LocalRepoState.PULL_COMPLETE, "Get latest software updates", "Setup_Local_Repo")
+        self.git.pull_latest(self.repo, self.branch_name, self.queue, checkout=True)
+        return None
+
+    def pull_complete(self):
+        """
+        Set the available versions once the latest updates have been pulled
+        """
+        if self.process_status == "success":
+            self.set_versions(self.repo)
+            self.process_stop()
+            self.set_next_config()
+        elif self.process_status == "error":
+            self.process_error("Could not pull latest updates from GitHub")
+            self.log.error("Could not pull updates from GitHub: %s", self.process_data)
+        return None
 
     def set_versions(self, repo):
         """
@@ -240,22 +318,22 @@ class SelectVersionConfig(WindowLayout):
 
         Once versions obtained, set appropriately
         """
-        self.latest_prod = self.git.get_latest_prod(self.repo)
+        self.latest_prod, self.latest_devel, self.version_list = self.git.get_all_versions(self.repo)
         if self.latest_prod:
             self.latest_prod_radio.configure(text=f"Latest Production ({self.latest_prod[0]}) - Recommended!")
         else:
             self.latest_prod_radio.grid_remove()
             self.select_version.set(-1)
-        self.latest_devel = self.git.get_latest_devel(self.repo)
         if self.latest_devel:
             self.latest_devel_radio.configure(text=f"Latest Development ({self.latest_devel[0]})")
         else:
             self.latest_devel_radio.grid_remove()
-        self.version_list = self.git.get_repo_versions(self.repo)
-        self.version_list.update({'v9.9.9-Devel devel branch':
-                                  {'major': 9, 'minor': 9, 'patch': 9, 'type': 'Devel', 'ref': 'origin/devel'}})
+        self.version_list[_DEVEL_BRANCH_VERSION] = _DEVEL_SENTINEL
         if self.version_list:
-            version_select = list(self.version_list.keys())
+            version_select = tuple(self.version_list)
+            if len(version_select) > _VERSION_COMBO_LIMIT + 1:
+                # Keep the devel branch entry added last, the rest are only added if "Show all..." is chosen
+                version_select = version_select[:_VERSION_COMBO_LIMIT] + (_DEVEL_BRANCH_VERSION, _SHOW_ALL_VERSIONS)
             self.select_version_combo.configure(values=version_select)
         self.set_version()
 
@@ -289,6 +367,9 @@ class SelectVersionConfig(WindowLayout):
         """
         Function to set select a specific version when setting via combobox
         """
+        if value == _SHOW_ALL_VERSIONS:
+            self.select_version_combo.configure(values=tuple(self.version_list))
+            self.select_version_combo.set("Select a version")
         if self.select_version.get() != 2:
             self.select_version.set(2)
         self.set_version()
@@ -299,25 +380,22 @@ class SelectVersionConfig(WindowLayout):
         """
         if self.config_option.get() == 0:
             self.master.use_existing = False
-            set_version = None
+            chosen_version = None
             if self.select_version.get() == 0:
-                set_version = self.latest_prod[0]
+                chosen_version = self.latest_prod[0]
                 self.next_back.enable_next()
             elif self.select_version.get() == 1:
-                set_version = self.latest_devel[0]
+                chosen_version = self.latest_devel[0]
                 self.next_back.enable_next()
             elif self.select_version.get() == 2:
                 if self.select_version_combo.get() != "Select a version":
-                    set_version = self.select_version_combo.get()
+                    chosen_version = self.select_version_combo.get()
                     self.next_back.enable_next()
-            if self.set_version:
-                self.next_back.set_next_command(lambda next_product=self.product,
-                                                set_version=set_version: self.master.switch_view(next_product,
-                                                                                                 None,
-                                                                                                 set_version))
+            if chosen_version is not None:
+                self.next_back.set_next_command(partial(self.master.switch_view, self.product, None, chosen_version))
             else:
                 self.next_back.disable_next()
-            self.next_back.set_next_text(f"Configure {pd[self.product]['product_name']}")
+            self.next_back.set_next_text(f"Configure {self.product_name}")
         elif self.config_option.get() == 1:
             self.master.use_existing = True
             self.next_back.set_next_command(self.copy_config_files)
@@ -348,16 +426,20 @@ class SelectVersionConfig(WindowLayout):
         - Contains at least the specified minimum config files
         """
         if self.config_path.get():
-            if os.path.realpath(self.config_path.get()) == os.path.realpath(self.product_dir):
+            try:
+                same_dir = os.path.samefile(self.config_path.get(), self.product_dir)
+            except OSError:
+                same_dir = os.path.realpath(self.config_path.get()) == os.path.realpath(self.product_dir)
+            if same_dir:
                 self.process_error("You cannot use EX-Installer's own generated files as these will be overwritten")
                 self.next_back.disable_next()
                 self.log.error(f"EX-Installer repository folder location chosen: {self.product_dir}")
             else:
-                config_files = fm.get_config_files(self.config_path.get(), pd[self.product]["minimum_config_files"])
+                config_files = fm.get_config_files(self.config_path.get(), self.minimum_config_files)
                 if config_files:
                     self.next_back.enable_next()
                 else:
-                    file_names = ", ".join(pd[self.product]["minimum_config_files"])
+                    file_names = ", ".join(self.minimum_config_files)
                     self.process_error(("Selected configuration directory is missing the required files: " +
                                        f"{file_names}"))
                     self.next_back.disable_next()
@@ -372,12 +454,12 @@ class SelectVersionConfig(WindowLayout):
         needed on subsequent passes thru the logic
         """
         file_list = []
-        min_list = fm.get_config_files(self.product_dir, pd[self.product]["minimum_config_files"])
+        min_list = fm.get_config_files(self.product_dir, self.minimum_config_files)
         if min_list:
             file_list += min_list
         other_list = None
-        if "other_config_files" in pd[self.product]:
-            other_list = fm.get_config_files(self.product_dir, pd[self.product]["other_config_files"])
+        if self.other_config_files is not None:
+            other_list = fm.get_config_files(self.product_dir, self.other_config_files)
         if other_list:
             file_list += other_list
         self.log.debug("Deleting files: %s", file_list)
@@ -392,11 +474,11 @@ class SelectVersionConfig(WindowLayout):
         Function to copy config files from selected directory to product directory
         also switches view to advanced_config if copy is successful
         """
-        copy_list = fm.get_config_files(self.config_path.get(), pd[self.product]["minimum_config_files"])
+        copy_list = fm.get_config_files(self.config_path.get(), self.minimum_config_files)
         if copy_list:
             extra_list = None
-            if "other_config_files" in pd[self.product]:
-                extra_list = fm.get_config_files(self.config_path.get(), pd[self.product]["other_config_files"])
+            if self.other_config_files is not None:
+                extra_list = fm.get_config_files(self.config_path.get(), self.other_config_files)
             if extra_list:
                 copy_list += extra_list
             file_copy = fm.copy_config_files(self.config_path.get(), self.product_dir, copy_list)
@@ -416,7 +498,7 @@ class SelectVersionConfig(WindowLayout):
 
         Resolution means perforing a git hard reset, cancel means exiting the app
         """
-        message = f"WARNING: The following changes have been detected in {pd[self.product]['product_name']}:\n"
+        message = f"WARNING: The following changes have been detected in {self.product_name}:\n"
         for change in changes:
             message += change + "\n"
         message += ("\nYou can either override these changes or cancel and resolve these issues manually.\n\n"
@@ -428,6 +510,6 @@ class SelectVersionConfig(WindowLayout):
                                  font=self.common_fonts.instruction_font)
         if resolver.get() == "Override":
             self.git.git_hard_reset(self.repo)
-            self.setup_local_repo("setup_local_repo")
+            self.setup_local_repo(LocalRepoState.SETUP)
         else:
             self.parent.switch_view("select_product")